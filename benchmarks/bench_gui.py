@@ -0,0 +1,308 @@
+# GUI build/render benchmark for simpletkgrid.tkt
+#
+# Usage:
+#   python benchmarks/bench_gui.py [--sizes 10,100,1000,10000] [--repeat 3] [--output FILE]
+#   python benchmarks/bench_gui.py --compare BASE.json NEW.json
+#
+# If $DISPLAY is not set, a local virtual X server (Xvfb) is started for the run.
+# Results are printed as JSON (minimum time over repeats), so two runs can be compared.
+import gc
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+
+DEFAULT_SIZES = "10,100,1000,10000"
+
+
+@contextmanager
+def virtual_display(display: Optional[str] = None) -> Iterator[str]:
+    """Start Xvfb if there is no display"""
+    if display is None:
+        display = os.environ.get("DISPLAY")
+    if display:
+        os.environ["DISPLAY"] = display
+        yield display
+        return
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        raise RuntimeError("No display and Xvfb is not installed")
+    for n in range(99, 199):
+        if not Path(f"/tmp/.X{n}-lock").exists():
+            break
+    display = f":{n}"
+    proc = subprocess.Popen(
+        [xvfb, display, "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(100):
+            if Path(f"/tmp/.X11-unix/X{n}").exists():
+                break
+            time.sleep(0.05)
+        os.environ["DISPLAY"] = display
+        yield display
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def _rss() -> int:
+    """Resident set size (bytes)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _best(func: Callable[[], Dict[str, float]], repeat: int) -> Dict[str, float]:
+    runs = [func() for _ in range(repeat)]
+    return {k: min(r[k] for r in runs) for k in runs[0]}
+
+
+def _root():
+    from simpletkgrid import RootWindow
+    root = RootWindow(title="bench", maxcolumn=4)
+    root.update()
+    return root
+
+
+def _adders(root) -> Dict[str, Callable[[int], None]]:
+    def _labels(i: int) -> None:
+        root.labels.add(f"label{i}")
+    def _buttons(i: int) -> None:
+        root.buttons.add(f"button{i}", _noop)
+    def _radiobuttons(i: int) -> None:
+        root.radiobuttons.add(f"radio{i}", i, root.stringvars["radio"])
+    def _entries(i: int) -> None:
+        root.entries.add(f"entry{i}", str(i))
+    return dict(labels=_labels, buttons=_buttons, radiobuttons=_radiobuttons, entries=_entries)
+
+
+def _noop(event=None) -> None:
+    return None
+
+
+def bench_window(repeat: int) -> Dict[str, Any]:
+    from simpletkgrid import SubWindow
+
+    def _rootwindow() -> Dict[str, float]:
+        t0 = time.perf_counter()
+        root = _root()
+        t1 = time.perf_counter()
+        root.destroy()
+        return dict(construct_ms=(t1 - t0) * 1000)
+
+    # NOTE: versions before pooled windows have neither SubWindow(pooled=...) nor SubWindow.open()
+    _haspool = hasattr(SubWindow, "open")
+
+    def _subwindow(pooled: bool, n: int = 50) -> Callable[[], Dict[str, float]]:
+        def _run() -> Dict[str, float]:
+            root = _root()
+            _kwargs = dict(pooled=pooled) if _haspool else dict()
+
+            class _Window(SubWindow):
+                def __init__(self) -> None:
+                    _ret = super().__init__(title="sub", **_kwargs)
+                    for i in range(10):
+                        self.labels.add(f"label{i}")
+                        self.entries.add(f"entry{i}", str(i))
+                    self.buttons.add("Close", self.close)
+                    return _ret
+
+            _open = _Window.open if _haspool else _Window
+            t0 = time.perf_counter()
+            w = _open()
+            root.update()
+            t1 = time.perf_counter()
+            w.close()
+            for _ in range(n):
+                w = _open()
+                root.update()
+                w.close()
+            root.update()
+            t2 = time.perf_counter()
+            root.destroy()
+            if _haspool:
+                SubWindow._pool.pop(_Window, None)
+            return dict(first_open_ms=(t1 - t0) * 1000, cycle_ms=(t2 - t1) * 1000 / n)
+        return _run
+
+    results = dict(
+        rootwindow=_best(_rootwindow, repeat),
+        subwindow=_best(_subwindow(False), repeat),
+    )
+    if _haspool:
+        results["subwindow_pooled"] = _best(_subwindow(True), repeat)
+    return results
+
+
+def bench_add(sizes: List[int], repeat: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = dict()
+    for kind in ("labels", "buttons", "radiobuttons", "entries"):
+        results[kind] = dict()
+        for n in sizes:
+            def _run() -> Dict[str, float]:
+                root = _root()
+                root.stringvars.add("radio")
+                add = _adders(root)[kind]
+                t0 = time.perf_counter()
+                for i in range(n):
+                    add(i)
+                t1 = time.perf_counter()
+                root.update()
+                t2 = time.perf_counter()
+                root.destroy()
+                return dict(
+                    add_us_per_widget=(t1 - t0) * 1e6 / n,
+                    render_ms=(t2 - t1) * 1000,
+                )
+            results[kind][str(n)] = _best(_run, repeat)
+    return results
+
+
+def bench_memory(n: int) -> Dict[str, Any]:
+    """Memory per widget (RSS and Python heap)"""
+    results: Dict[str, Any] = dict()
+    for kind in ("labels", "buttons", "radiobuttons", "entries"):
+        root = _root()
+        root.stringvars.add("radio")
+        add = _adders(root)[kind]
+        gc.collect()
+        rss0 = _rss()
+        tracemalloc.start()
+        for i in range(n):
+            add(i)
+        root.update()
+        py, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        gc.collect()
+        rss1 = _rss()
+        root.destroy()
+        results[kind] = dict(rss_bytes_per_widget=(rss1 - rss0) / n, py_bytes_per_widget=py / n)
+    return results
+
+
+def bench_values(n: int, repeat: int) -> Dict[str, Any]:
+    def _stringvars() -> Dict[str, float]:
+        root = _root()
+        root.stringvars.add("v")
+        t0 = time.perf_counter()
+        for i in range(n):
+            root.stringvars.set("v", str(i))
+        t1 = time.perf_counter()
+        for _ in range(n):
+            root.stringvars.get("v")
+        t2 = time.perf_counter()
+        root.destroy()
+        return dict(set_per_s=n / (t1 - t0), get_per_s=n / (t2 - t1))
+
+    def _entries() -> Dict[str, float]:
+        root = _root()
+        _n = min(n, 1000)
+        for i in range(_n):
+            root.entries.add(i, "")
+        t0 = time.perf_counter()
+        for i in range(_n):
+            root.entries.set(i, str(i))
+            root.entries.get(i)
+        t1 = time.perf_counter()
+        root.destroy()
+        return dict(roundtrip_us=(t1 - t0) * 1e6 / _n)
+
+    return dict(stringvars=_best(_stringvars, repeat), entries=_best(_entries, repeat))
+
+
+def bench_latency(n: int = 200, nwidgets: int = 1000) -> Dict[str, Any]:
+    """Delay between after(0) and its callback, idle and with many widgets"""
+    results: Dict[str, Any] = dict()
+    for label, size in (("idle", 0), (f"{nwidgets}_labels", nwidgets)):
+        root = _root()
+        for i in range(size):
+            root.labels.add(f"label{i}")
+        root.update()
+        delays: List[float] = []
+        for _ in range(n):
+            t0 = time.perf_counter()
+            root.after(0, lambda t0=t0: delays.append(time.perf_counter() - t0))
+            root.update()
+        root.destroy()
+        delays.sort()
+        results[label] = dict(
+            p50_us=delays[len(delays) // 2] * 1e6,
+            p99_us=delays[int(len(delays) * 0.99)] * 1e6,
+            max_us=delays[-1] * 1e6,
+        )
+    return results
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any], prefix: str = "") -> List[str]:
+    """Lines of `key: base -> new (ratio)` for common numeric values"""
+    lines = []
+    for k, v in base.items():
+        if k not in new:
+            continue
+        if isinstance(v, dict):
+            lines += compare(v, new[k], f"{prefix}{k}.")
+        elif isinstance(v, (int, float)) and isinstance(new[k], (int, float)) and v != 0:
+            lines.append(f"{prefix}{k}: {v:.4g} -> {new[k]:.4g} ({new[k] / v:.2f}x)")
+    return lines
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = ArgumentParser()
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Numbers of widgets (comma separated)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--display", default=None, help="X display (default: $DISPLAY or Xvfb)")
+    parser.add_argument("--output", default=None, help="JSON output file (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), default=None)
+    args = parser.parse_args(args)
+
+    if args.compare is not None:
+        base, new = (json.loads(Path(p).read_text()) for p in args.compare)
+        print("\n".join(compare(base["results"], new["results"])))
+        return 0
+
+    sizes = [int(x) for x in args.sizes.split(",")]
+    with virtual_display(args.display):
+        results = dict(
+            window=bench_window(args.repeat),
+            add=bench_add(sizes, args.repeat),
+            memory=bench_memory(max(sizes)),
+            values=bench_values(10000, args.repeat),
+            latency=bench_latency(),
+        )
+
+    import simpletkgrid
+    output = json.dumps(
+        dict(
+            version=simpletkgrid.__version__,
+            python=sys.version.split()[0],
+            sizes=sizes,
+            repeat=args.repeat,
+            results=results,
+        ),
+        indent=2,
+    )
+    if args.output is None:
+        print(output)
+    else:
+        Path(args.output).write_text(output + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
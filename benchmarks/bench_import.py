@@ -0,0 +1,115 @@
+# Import-time benchmark for simpletkgrid
+#
+# Usage:
+#   python benchmarks/bench_import.py [--repeat 5] [--top 10] [--check] [--output FILE]
+#
+# Each target statement is run in a fresh interpreter with `-X importtime`.
+# Modules already imported at interpreter startup (`-c pass`) are excluded.
+# The result is printed as JSON (minimum over repeats).
+import json
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+
+SRCDIR = Path(__file__).resolve().parent.parent / "src"
+TARGETS: Dict[str, str] = {
+    "package": "import simpletkgrid",
+    "Config": "from simpletkgrid import Config",
+    "RootWindow": "from simpletkgrid import RootWindow",
+    "dialog": "from simpletkgrid import dialog",
+}
+# Modules which must not be imported by the target (--check)
+FORBIDDEN: Dict[str, Set[str]] = {
+    "package": {"tkinter", "configparser", "asyncio", "typing"},
+    "Config": {"tkinter", "asyncio", "shutil", "datetime"},
+    "RootWindow": {"asyncio", "tkinter.filedialog", "tkinter.messagebox"},
+    "dialog": {"asyncio", "tkinter.filedialog", "tkinter.messagebox"},
+}
+
+
+def _importtime(statement: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Returns:
+        [(module, self_us, cumulative_us, depth), ...]
+    """
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRCDIR), env.get("PYTHONPATH")]))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    _ret = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _self, _cumulative, _name = line[len("import time:"):].split("|")
+        if not _self.strip().isdigit():
+            # header
+            continue
+        _depth = (len(_name) - len(_name.lstrip()) - 1) // 2
+        _ret.append((_name.strip(), int(_self), int(_cumulative), _depth))
+    return _ret
+
+
+def measure(statement: str, baseline: Set[str]) -> Dict[str, object]:
+    records = [r for r in _importtime(statement) if r[0] not in baseline]
+    return dict(
+        total_us=sum(r[2] for r in records if r[3] == 0),
+        modules={r[0]: r[1] for r in records},
+    )
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Number of modules in the breakdown")
+    parser.add_argument("--check", action="store_true", help="Fail if a forbidden module is imported")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if a total exceeds this")
+    parser.add_argument("--output", default=None, help="JSON output file (default: stdout)")
+    args = parser.parse_args(args)
+
+    baseline = {r[0] for r in _importtime("pass")}
+    results: Dict[str, dict] = dict()
+    errors: List[str] = []
+    for name, statement in TARGETS.items():
+        runs = [measure(statement, baseline) for _ in range(args.repeat)]
+        best = min(runs, key=lambda x: x["total_us"])
+        modules: Dict[str, int] = best["modules"]
+        results[name] = dict(
+            statement=statement,
+            total_ms=best["total_us"] / 1000,
+            n_modules=len(modules),
+            top_self_ms={
+                k: v / 1000
+                for k, v in sorted(modules.items(), key=lambda x: -x[1])[:args.top]
+            },
+        )
+        if args.check:
+            for m in sorted(FORBIDDEN[name] & set(modules)):
+                errors.append(f"{name}: '{m}' is imported by `{statement}`")
+        if args.max_ms is not None and results[name]["total_ms"] > args.max_ms:
+            errors.append(f"{name}: {results[name]['total_ms']:.1f}ms > {args.max_ms}ms")
+
+    output = json.dumps(
+        dict(python=sys.version.split()[0], repeat=args.repeat, results=results, errors=errors),
+        indent=2,
+    )
+    if args.output is None:
+        print(output)
+    else:
+        Path(args.output).write_text(output + "\n")
+    for e in errors:
+        print(e, file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
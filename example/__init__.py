@@ -2,7 +2,6 @@ from argparse import ArgumentParser
 from typing import Optional, List
 from pathlib import Path
 
-from .gui import main as gui_main
 from src.simpletkgrid import Config
 from src.simpletkgrid.config import DEFAULTSECT
 from .define import (
@@ -21,7 +20,7 @@ __all__ = (
 )
 
 
-def main(args: Optional[List[str]] = None) -> None:
+def main(args: Optional[List[str]] = None) -> Optional[int]:
     parser = ArgumentParser()
 
     parser_mode = parser.add_mutually_exclusive_group()
@@ -42,6 +41,18 @@ def main(args: Optional[List[str]] = None) -> None:
         "--config-section",
         required=False, default=DEFAULTSECT,
         help=messages.option.configsection)
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int, required=False, default=None,
+        help=messages.option.jobs)
+    parser.add_argument(
+        "--pattern",
+        required=False, default="*",
+        help=messages.option.pattern)
+    parser.add_argument(
+        "--output", "-o",
+        required=False, default=None,
+        help=messages.option.output)
     parser.add_argument(
         "--version", "-V",
         action='version',
@@ -80,8 +91,11 @@ def main(args: Optional[List[str]] = None) -> None:
     config.cast()
 
     if background_mode:
-        pass
+        from .batch import main as batch_main
+        return batch_main(config=config, args=args, configfilepath=configfilepath)
     else:
+        # NOTE: imported here, so that background mode does not import tkinter
+        from .gui import main as gui_main
         return gui_main(config=config, args=args)
 
     return None
@@ -0,0 +1,129 @@
+import sys
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from hashlib import sha256
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+from src.simpletkgrid import Config
+# NOTE: tkinter must not be imported here (or in the worker processes),
+#       so that background mode runs on servers without a display.
+
+
+def iter_inputs(
+    workdir: Path,
+    pattern: str = "*",
+    n: Any = None,
+    exclude: Iterable[Path] = (),
+) -> Iterator[Path]:
+    """Input files in the working directory, sorted by path
+
+    Only the listing is sorted (cheap compared with processing the files);
+    the files are yielded one by one.
+
+    Args:
+        n: Maximum number of files. If not a positive int (e.g. None or empty in the config), all files
+        exclude: Files to skip (e.g. the configuration file)
+    """
+    _exclude = {p.resolve() for p in exclude}
+    _paths = (p for p in sorted(workdir.glob(pattern)) if p.is_file() and p.resolve() not in _exclude)
+    if type(n) is int and n > 0:
+        _paths = islice(_paths, n)
+    return _paths
+
+
+def process(path: Path, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Job for one input file (runs in a worker process)
+
+    Args:
+        options: Config values (plain dict, picklable)
+    """
+    _hash = sha256()
+    _size = 0
+    _lines = 0
+    with path.open(mode="rb") as f:
+        for _chunk in iter(lambda: f.read(1 << 20), b""):
+            _hash.update(_chunk)
+            _size += len(_chunk)
+            _lines += _chunk.count(b"\n")
+    return dict(path=str(path), size=_size, lines=_lines, sha256=_hash.hexdigest())
+
+
+def imap_ordered(
+    executor: Executor,
+    func: Callable,
+    items: Iterable[Any],
+    *args,
+    maxpending: int,
+) -> Iterator[Tuple[Any, Future]]:
+    """Executor.map() which does not consume all items up front
+
+    At most `maxpending` items are submitted at once. Results are yielded in input order.
+
+    Yields:
+        (item, done future)
+    """
+    _pending: Deque[Tuple[Any, Future]] = deque()
+    for item in items:
+        _pending.append((item, executor.submit(func, item, *args)))
+        if len(_pending) >= maxpending:
+            item, future = _pending.popleft()
+            future.exception()  # wait
+            yield item, future
+    while len(_pending) > 0:
+        item, future = _pending.popleft()
+        future.exception()
+        yield item, future
+
+
+def run(
+    config: Config,
+    pattern: str = "*",
+    jobs: Optional[int] = None,
+    output: Optional[Path] = None,
+    exclude: Iterable[Path] = (),
+) -> int:
+    """Process all inputs in `config["workdir"]` with a process pool
+
+    Args:
+        jobs: Number of worker processes (If None, os.cpu_count())
+        output: TSV file (If None, stdout)
+        exclude: Files which are not inputs
+
+    Returns:
+        Number of failed inputs
+    """
+    import os
+    if jobs is None or jobs <= 0:
+        jobs = os.cpu_count() or 1
+    options = config.to_dict()
+    if output is not None:
+        exclude = [*exclude, output]
+    inputs = iter_inputs(Path(config["workdir"]), pattern=pattern, n=config["n"], exclude=exclude)
+
+    _failed = 0
+    _out = sys.stdout if output is None else output.open(mode="w", encoding="utf-8")
+    try:
+        _out.write("path\tsize\tlines\tsha256\n")
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for path, future in imap_ordered(executor, process, inputs, options, maxpending=jobs * 2):
+                e = future.exception()
+                if e is not None:
+                    _failed += 1
+                    print(f"{path}: {type(e).__name__}: {e}", file=sys.stderr)
+                    continue
+                r = future.result()
+                _out.write(f"{r['path']}\t{r['size']}\t{r['lines']}\t{r['sha256']}\n")
+                _out.flush()
+    finally:
+        if output is not None:
+            _out.close()
+    return _failed
+
+
+def main(config: Config, args, configfilepath: Optional[Path] = None) -> int:
+    output = None if args.output is None else Path(args.output)
+    _exclude = [] if configfilepath is None else [configfilepath]
+    _failed = run(config, pattern=args.pattern, jobs=args.jobs, output=output, exclude=_exclude)
+    return 1 if _failed > 0 else 0
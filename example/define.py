@@ -26,6 +26,9 @@ class messages(object):
         workdir: str = "Working directory path"
         configfile: str = "Configuration file path"
         configsection: str = "Configuration section name"
+        jobs: str = "(Background mode) Number of worker processes (default: number of CPUs)"
+        pattern: str = "(Background mode) Glob pattern of input files in workdir"
+        output: str = "(Background mode) Output file path (default: stdout)"
     option = __OptionMessages()
 
     @dataclass(frozen=True)
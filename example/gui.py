@@ -7,6 +7,7 @@ from tkinter import (
 
 from src.simpletkgrid import (
     Config,
+    ConfigBinding,
     RootWindow,
     SubWindow,
     dialog,
@@ -20,6 +21,8 @@ from .define import (
 
 def main(config: Config, args) -> None:
     class AboutWindow(SubWindow):
+        pooled = True
+
         def __init__(self) -> None:
             _ret = super().__init__(title="About")
             self.labels.add(APPNAME_FULL, fontscale="big")
@@ -34,6 +37,8 @@ def main(config: Config, args) -> None:
             return None
 
     class ConfigWindow(SubWindow):
+        pooled = True
+
         def __init__(self) -> None:
             _ret = super().__init__(title="Config", fontsize=10, maxcolumn=1)
             self.entries.defaultwidth = 100
@@ -55,6 +60,8 @@ def main(config: Config, args) -> None:
                 if k == "workdir":
                     self.buttons.add("Browse", lambda: _filediag("workdir", "dir"), fullspan=True)
 
+            self.binding = ConfigBinding(config, self.entries, validate=True)
+
             # blank row
             self.labels.add("", fullspan=True)
 
@@ -65,13 +72,13 @@ def main(config: Config, args) -> None:
 
             return _ret
 
+        def refresh(self) -> None:
+            self.binding.discard()
+            self.binding.push()
+            return None
+
         def save(self, event=None) -> None:
-            _changed = False
-            for k, entry in self.entries.items():
-                v = entry.get()
-                if str(v) != str(config[k]):
-                    _changed = True
-                    config[k] = v
+            _changed = len(self.binding.pull()) > 0
 
             if not _changed:
                 messagebox.showinfo("Config", "Nothing changed.")
@@ -84,6 +91,8 @@ def main(config: Config, args) -> None:
             return None
 
     class TestWindow01(SubWindow):
+        pooled = True
+
         def __init__(self) -> None:
             _ret = super().__init__(title="Config", fontsize=10, button=True, radiobutton=True)
             self.stringvars.add("key1", defaultvalue="")
@@ -97,6 +106,10 @@ def main(config: Config, args) -> None:
             self.bind("<Escape>", self.close)
             return _ret
 
+        def refresh(self) -> None:
+            self.stringvars.set("key1", "")
+            return None
+
         def update(self, event=None) -> None:
             val = self.stringvars.get("key1")
             if len(val) > 0:
@@ -126,15 +139,15 @@ def main(config: Config, args) -> None:
         return None
 
     def _about(event=None):
-        AboutWindow()
+        AboutWindow.open()
         return None
 
     def _config(event=None):
-        ConfigWindow()
+        ConfigWindow.open()
         return None
 
     def _test01(event=None):
-        TestWindow01()
+        TestWindow01.open()
         return None
 
     root = RootWindow(
@@ -3,17 +3,53 @@
 # Released under the MIT license
 # Supported Python versions: 3.8
 # Requires: (using only Python Standard Library)
-from .config import Config
-from .tkt import (
-    RootWindow,
-    SubWindow,
-    dialog,
-)
+TYPE_CHECKING = False  # typing.TYPE_CHECKING (typing is not imported here)
 
 __all__ = [
     "Config",
+    "ConfigBinding",
+    "RecentPaths",
     "RootWindow",
     "SubWindow",
+    "Validator",
     "dialog",
+    "lifecycle",
 ]
 __version__ = "1.0.0"
+
+# NOTE: submodules are imported on first attribute access,
+#       so that `Config` can be used without importing tkinter.
+_LAZY_ATTRIBUTES = {
+    "Config": ".config",
+    "ConfigBinding": ".tkt",
+    "RecentPaths": ".tkt",
+    "RootWindow": ".tkt",
+    "SubWindow": ".tkt",
+    "Validator": ".tkt",
+    "dialog": ".tkt",
+    "lifecycle": ".tkt",
+}
+if TYPE_CHECKING:
+    from .config import Config
+    from .tkt import (
+        ConfigBinding,
+        RecentPaths,
+        RootWindow,
+        SubWindow,
+        Validator,
+        dialog,
+        lifecycle,
+    )
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        from importlib import import_module
+        value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -3,9 +3,7 @@
 # Released under the MIT license
 # Supported Python versions: 3.7, 3.8, 3.9, 3.10, 3.11
 # Requires: (using only Python Standard Library)
-import shutil
 from configparser import ConfigParser, DEFAULTSECT
-from datetime import datetime
 from pathlib import Path
 from typing import Optional, Union, Dict, Any
 from warnings import warn
@@ -441,6 +439,9 @@ class Config(object):
                     data_save[k] = data[k]
 
             if keep_original_file:
+                # NOTE: imported here to keep import time short
+                import shutil
+                from datetime import datetime
                 filepath_back = filepath.parent / f"{filepath.name}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
                 shutil.copyfile(filepath, filepath_back)
         else:
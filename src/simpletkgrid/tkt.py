@@ -3,24 +3,368 @@
 # Released under the MIT license
 # Supported Python versions: 3.8
 # Requires: (using only Python Standard Library)
-from typing import Optional, Union, Dict, Any, List, Tuple
+import re
+import weakref
+from contextlib import contextmanager
+from functools import partial
+from typing import Optional, Union, Dict, Any, List, Tuple, Callable, Iterable, Iterator, IO, TYPE_CHECKING
 from pathlib import Path
 from tkinter import (
     Tk,
     ttk,
+    Canvas,
+    Text,
     Toplevel,
     Variable,
     StringVar,
     Entry,
-    filedialog,
-    messagebox,
+    Listbox,
+    Misc,
+    TclError,
     W,
     END,
 )
+from tkinter.font import Font
+# NOTE: asyncio, filedialog and messagebox are imported on first use (import time)
+if TYPE_CHECKING:
+    import asyncio
+    from .config import Config
 
 
 FONTSIZE = 12
 FONTSCALE = 1.5
+ASYNC_INTERVAL = 10  # ms
+CONSOLE_INTERVAL = 50  # ms
+CONSOLE_MAXLINES = 10000
+CHART_INTERVAL = 100  # ms
+CHART_CAPACITY = 10000
+CHOICE_LIMIT = 500
+AUTOCOMPLETE_TOPK = 10
+PROGRESS_FPS = 10
+CHART_COLORS = ("#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b")
+SAVE_CHUNKSIZE = 1 << 20
+PROBE_TIMEOUT = 0.5  # sec
+PROBE_TTL = 10.0  # sec
+INVALID_BACKGROUND = "#ffd6d6"
+
+
+class _AsyncBridge(object):
+    def __init__(self, root: Misc, interval: int = ASYNC_INTERVAL) -> None:
+        """Run coroutines for a Tk root on one event loop
+
+        If `RootWindow.async_mainloop()` is running, coroutines are scheduled on its loop.
+        Otherwise they run on a private event loop, which is stepped from `after()` while
+        it has pending tasks. `RootWindow.run_async()` runs `async_mainloop()` on the
+        private loop itself, so tasks started before continue there.
+        """
+        self._rootref = weakref.ref(root)
+        self.interval: int = interval
+        self.loop: Optional["asyncio.AbstractEventLoop"] = None  # attached (running) loop
+        self._private: Optional["asyncio.AbstractEventLoop"] = None
+        self._stepping: bool = False
+        # NOTE: the event loop keeps only weak references to tasks
+        self._tasks: set = set()
+        return None
+
+    def attach(self, loop: "asyncio.AbstractEventLoop") -> None:
+        """Use a running event loop (async_mainloop)
+
+        Raises:
+            RuntimeError: If tasks of the private loop are pending and `loop` is another loop
+        """
+        if loop is not self._private and self._pending(self._private):
+            raise RuntimeError(
+                "Coroutine commands are still running on another event loop; "
+                "use RootWindow.run_async() instead of asyncio.run(root.async_mainloop())"
+            )
+        self.loop = loop
+        return None
+
+    def detach(self) -> None:
+        self.loop = None
+        return None
+
+    @property
+    def root(self) -> Optional[Misc]:
+        return self._rootref()
+
+    def private(self) -> "asyncio.AbstractEventLoop":
+        """Private event loop (created if needed)"""
+        import asyncio
+        if self._private is None or self._private.is_closed():
+            self._private = asyncio.new_event_loop()
+        return self._private
+
+    def _pending(self, loop: Optional["asyncio.AbstractEventLoop"]) -> bool:
+        if loop is None or loop.is_closed():
+            return False
+        # NOTE: also until done callbacks (_done) of finished tasks have run
+        return any(t.get_loop() is loop for t in self._tasks)
+
+    def spawn(self, coro) -> "asyncio.Task":
+        if self.loop is not None and not self.loop.is_closed():
+            loop = self.loop
+        else:
+            loop = self.private()
+        _task = loop.create_task(coro)
+        self._tasks.add(_task)
+        _task.add_done_callback(self._done)
+        if loop is self._private and not loop.is_running() and not self._stepping:
+            self._stepping = True
+            self._after(0)
+        return _task
+
+    def _done(self, task: "asyncio.Task") -> None:
+        """Forget the task and report its exception (like other Tk callbacks)"""
+        self._tasks.discard(task)
+        if task.cancelled():
+            return None
+        e = task.exception()
+        if e is None:
+            return None
+        root = self.root
+        if root is not None:
+            root.report_callback_exception(type(e), e, e.__traceback__)
+        else:
+            import traceback
+            traceback.print_exception(type(e), e, e.__traceback__)
+        return None
+
+    @staticmethod
+    def _inloop() -> bool:
+        """True if called from a running event loop"""
+        import asyncio
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+
+    def _step(self) -> None:
+        """Run one iteration of the private event loop (Tk mainloop)"""
+        loop = self._private
+        if not self._pending(loop) or loop.is_running() or self._inloop():
+            # done, or run by run_async()
+            self._stepping = False
+            if not self._pending(loop):
+                self._close_private()
+            return None
+        loop.call_soon(loop.stop)
+        loop.run_forever()
+        if self._after(self.interval):
+            return None
+        self._stepping = False
+        return None
+
+    def _after(self, ms: int) -> bool:
+        root = self.root
+        if root is None:
+            return False
+        try:
+            root.after(ms, self._step)
+        except TclError:
+            # root has been destroyed
+            return False
+        return True
+
+    def _close_private(self) -> None:
+        loop = self._private
+        if loop is not None and not loop.is_running() and not loop.is_closed():
+            loop.close()
+        self._private = None
+        return None
+
+    def close(self) -> None:
+        """Cancel the tasks of the private loop and close it (the root is being destroyed)"""
+        import asyncio
+        loop = self._private
+        if loop is None or loop.is_closed():
+            return None
+        _tasks = [t for t in self._tasks if t.get_loop() is loop and not t.done()]
+        for t in _tasks:
+            t.cancel()
+        if loop.is_running():
+            # closed by run_async()
+            return None
+        if len(_tasks) > 0 and not self._inloop():
+            loop.run_until_complete(asyncio.gather(*_tasks, return_exceptions=True))
+        self._close_private()
+        return None
+
+
+def _get_asyncbridge(master: Misc) -> _AsyncBridge:
+    root = master._root()
+    bridge = getattr(root, "_asyncbridge", None)
+    if bridge is None:
+        bridge = _AsyncBridge(root)
+        root._asyncbridge = bridge
+    return bridge
+
+
+_CO_COROUTINE = 0x80  # inspect.CO_COROUTINE
+def _iscoroutinefunction(func: Any) -> bool:
+    """inspect.iscoroutinefunction() without importing inspect/asyncio"""
+    while isinstance(func, partial):
+        func = func.func
+    func = getattr(func, "__func__", func)
+    code = getattr(func, "__code__", None)
+    return code is not None and bool(code.co_flags & _CO_COROUTINE)
+
+
+class CallbackStats(object):
+    # upper bounds of histogram buckets (ms)
+    BUCKETS: Tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf"))
+
+    def __init__(self, root: Misc) -> None:
+        """Wall time of callbacks (commands and bindings) and mainloop stalls
+
+        Enabled by `RootWindow.instrument()`. Only callbacks registered after that are timed.
+        """
+        self._rootref = weakref.ref(root)
+        self.current: Optional[str] = None  # running callback
+        self.stalls: List[Dict[str, Any]] = []
+        self._data: Dict[str, Dict[str, Any]] = dict()
+        self._tick: float = 0.0
+        self._tkthread: Optional[int] = None
+        self._watchdog = None
+        return None
+
+    @property
+    def root(self) -> Optional[Misc]:
+        return self._rootref()
+
+    def record(self, name: str, seconds: float) -> None:
+        from bisect import bisect_left
+        _ms = seconds * 1000
+        d = self._data.get(name)
+        if d is None:
+            d = self._data[name] = dict(count=0, total_ms=0.0, max_ms=0.0, histogram=[0] * len(self.BUCKETS))
+        d["count"] += 1
+        d["total_ms"] += _ms
+        if _ms > d["max_ms"]:
+            d["max_ms"] = _ms
+        d["histogram"][bisect_left(self.BUCKETS, _ms)] += 1
+        return None
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        from time import perf_counter
+        def _func(*args, **kwargs):
+            _parent, self.current = self.current, name
+            t0 = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, perf_counter() - t0)
+                self.current = _parent
+        return _func
+
+    def start_watchdog(self, threshold: int = 200, stream: Any = None) -> None:
+        """Dump the stack of the Tk thread when the mainloop does not tick for `threshold` ms
+
+        Call from the Tk thread.
+
+        Args:
+            stream: file-like for the dump (default: sys.stderr)
+        """
+        import sys
+        import threading
+        import time
+        import traceback
+        if stream is None:
+            stream = sys.stderr
+        self._tkthread = threading.get_ident()
+        self._tick = time.monotonic()
+        _interval = max(threshold // 4, 1)
+        _stop = threading.Event()
+        self._watchdog = _stop
+
+        def _ticker() -> None:
+            if _stop.is_set():
+                return None
+            self._tick = time.monotonic()
+            try:
+                if self.root is None:
+                    raise TclError("destroyed")
+                self.root.after(_interval, _ticker)
+            except TclError:
+                # destroyed
+                _stop.set()
+            return None
+
+        def _watch() -> None:
+            _reported = False
+            while not _stop.wait(_interval / 1000):
+                _stalled = (time.monotonic() - self._tick) * 1000
+                if _stalled < threshold:
+                    _reported = False
+                    continue
+                if _reported:
+                    continue
+                _reported = True
+                _frame = sys._current_frames().get(self._tkthread)
+                _stack = [] if _frame is None else traceback.format_stack(_frame)
+                _stall = dict(time=time.time(), stalled_ms=_stalled, callback=self.current, stack=_stack)
+                self.stalls.append(_stall)
+                stream.write(f"Mainloop stalled for {_stalled:.0f}ms in {self.current}:\n{''.join(_stack)}")
+                stream.flush()
+            return None
+
+        _ticker()
+        threading.Thread(target=_watch, daemon=True).start()
+        return None
+
+    def stop_watchdog(self) -> None:
+        if self._watchdog is not None:
+            self._watchdog.set()
+            self._watchdog = None
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(
+            buckets_ms=[str(x) for x in self.BUCKETS],
+            callbacks={k: dict(v, histogram=list(v["histogram"])) for k, v in self._data.items()},
+            stalls=list(self.stalls),
+        )
+
+    def save(self, filepath: Union[str, Path]) -> None:
+        """Export as JSON"""
+        import json
+        with Path(filepath).open(mode="w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return None
+
+
+def _wrap_command(
+    master: Misc,
+    command: Union[Callable, str, None],
+    name: Optional[str] = None,
+) -> Union[Callable, str, None]:
+    """Accept coroutine functions as widget commands and bindings (and time them if instrumented)
+
+    Args:
+        name: Name in CallbackStats
+    """
+    if not callable(command):
+        # None, or a Tcl script (str) accepted by bind()
+        return command
+    _stats: Optional[CallbackStats] = getattr(master._root(), "_callbackstats", None)
+    if _stats is not None:
+        _qualname = getattr(command, "__qualname__", repr(command))
+        name = _qualname if name is None else f"{name} {_qualname}"
+    if _iscoroutinefunction(command):
+        _coro = command
+        # NOTE: the widget holds the command; do not keep the master alive from it
+        _masterref = weakref.ref(master)
+        def command(*args) -> None:
+            _master = _masterref()
+            if _master is not None:
+                _get_asyncbridge(_master).spawn(_coro(*args))
+            return None
+    if _stats is not None:
+        command = _stats.wrap(name, command)
+    return command
+
+
 class LabelKw(dict):
     def __init__(self, fontsize: int = FONTSIZE):
         return super().__init__(
@@ -61,6 +405,91 @@ class LabelKw(dict):
         return self.get_customized(fontscale="small")
 
 
+def _to_fontscale(fontscale: Union[float, str, None]) -> float:
+    if fontscale is None:
+        return 1.0
+    elif type(fontscale) is str:
+        if fontscale == "big":
+            return FONTSCALE
+        elif fontscale == "small":
+            return 1 / FONTSCALE
+        else:
+            # ignored (same as LabelKw.get_customized)
+            return 1.0
+    return float(fontscale)
+
+
+class FontRegistry(object):
+    _count: int = 0
+
+    def __init__(self, master: Misc, fontsize: int = FONTSIZE) -> None:
+        """Interned named fonts and ttk styles of a window
+
+        One Font and one ttk style are created per (family, fontscale).
+        Widgets refer to the shared style, so `set_fontsize()` updates only the fonts.
+        ttk styles cannot be deleted; the style prefix of a released registry
+        (destroyed window) is reused by the next one.
+        """
+        self._masterref = weakref.ref(master)
+        self.fontsize: int = fontsize
+        self._fonts: Dict[Tuple[str, float], Font] = dict()
+        self._styles: Dict[Tuple[str, float, str], str] = dict()
+        self._style: Optional[ttk.Style] = None
+        # NOTE: styles belong to the interpreter, so free prefixes are kept on the root
+        self._free: List[str] = master._root().__dict__.setdefault("_fontprefixes", [])
+        if len(self._free) > 0:
+            self._prefix: Optional[str] = self._free.pop()
+        else:
+            type(self)._count += 1
+            self._prefix = f"stg{type(self)._count}"
+        return None
+
+    def _size(self, fontscale: float) -> int:
+        return int(self.fontsize * fontscale)
+
+    def font(self, family: Optional[str] = None, fontscale: Union[float, str, None] = None) -> Font:
+        if family is None:
+            family = ""
+        _key = (family, _to_fontscale(fontscale))
+        if _key not in self._fonts:
+            self._fonts[_key] = Font(root=self._masterref(), family=family, size=self._size(_key[1]))
+        return self._fonts[_key]
+
+    def style(
+        self,
+        family: Optional[str] = None,
+        fontscale: Union[float, str, None] = None,
+        widgetclass: str = "TLabel",
+    ) -> str:
+        """Get (or create) the style name for the font"""
+        if family is None:
+            family = ""
+        _key = (family, _to_fontscale(fontscale), widgetclass)
+        if _key not in self._styles:
+            if self._style is None:
+                self._style = ttk.Style(self._masterref())
+            _name = f"{self._prefix}_{len(self._styles)}.{widgetclass}"
+            self._style.configure(_name, font=self.font(family, _key[1]))
+            self._styles[_key] = _name
+        return self._styles[_key]
+
+    def set_fontsize(self, fontsize: int) -> None:
+        """Resize all fonts (widgets using the styles follow)"""
+        self.fontsize = fontsize
+        for (_, fontscale), font in self._fonts.items():
+            font.configure(size=self._size(fontscale))
+        return None
+
+    def release(self) -> None:
+        """Return the style prefix for reuse (the window is being destroyed)"""
+        if self._prefix is not None:
+            self._free.append(self._prefix)
+            self._prefix = None
+        self._styles.clear()
+        self._fonts.clear()
+        return None
+
+
 class GridKw(object):
     def __init__(self, maxcolumn: Optional[int] = None, sticky: str = W) -> None:
         self.row: int = 0
@@ -91,6 +520,22 @@ class GridKw(object):
             self.column = column
         return None
 
+    @contextmanager
+    def at(self, row: int, column: int = 0):
+        """Place widgets from (row, column) temporarily
+
+        Example:
+            >>> window.insert_rows(2)
+            >>> with window.gridkw.at(2):
+            ...     window.labels.add("inserted")
+        """
+        _saved = (self.row, self.column)
+        self.set(row=row, column=column)
+        try:
+            yield self
+        finally:
+            self.row, self.column = _saved
+
     def pull(self, columnspan: Optional[int] = None, fullspan: bool = False) -> Dict[str, Any]:
         if fullspan:
             columnspan = self.maxcolumn
@@ -109,7 +554,274 @@ class GridKw(object):
         return _ret
 
 
+class GridItem(object):
+    __slots__ = ("kind", "name", "widget", "row", "column", "columnspan", "_ownerref")
+
+    def __init__(
+        self,
+        kind: str,
+        name: Any,
+        widget: Misc,
+        row: int,
+        column: int,
+        columnspan: Optional[int] = 1,
+        owner: Any = None,
+    ) -> None:
+        """Widget placed in the grid (see WidgetRegistry)
+
+        Args:
+            owner: collection (Labels, Entries, ...) which holds the widget as `name`
+        """
+        self.kind = kind
+        self.name = name
+        self.widget = widget
+        self.row = row
+        self.column = column
+        if columnspan is None:
+            columnspan = 1
+        self.columnspan: int = columnspan
+        self._ownerref = None if owner is None else weakref.ref(owner)
+        return None
+
+    @property
+    def owner(self) -> Any:
+        return None if self._ownerref is None else self._ownerref()
+
+    @property
+    def key(self) -> Tuple[str, Any]:
+        return (self.kind, self.name)
+
+    @property
+    def cells(self) -> List[Tuple[int, int]]:
+        return [(self.row, c) for c in range(self.column, self.column + self.columnspan)]
+
+    def __repr__(self) -> str:
+        return f"{__class__.__name__}({self.kind}, {self.name!r}, row={self.row}, column={self.column})"
+
+
+class WidgetRegistry(object):
+    def __init__(self) -> None:
+        """Widgets of a window, indexed by name, kind, row and (row, column)
+
+        Names are unique per kind (same as in each collection).
+        """
+        self._items: Dict[Tuple[str, Any], GridItem] = dict()
+        self._kinds: Dict[str, Dict[Any, GridItem]] = dict()
+        self._rows: Dict[int, Dict[Tuple[str, Any], GridItem]] = dict()
+        self._cells: Dict[Tuple[int, int], Dict[Tuple[str, Any], GridItem]] = dict()
+        return None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(list(self._items.values()))
+
+    def clear(self) -> None:
+        """Forget all items (widgets are not destroyed)"""
+        self._items.clear()
+        self._kinds.clear()
+        self._rows.clear()
+        self._cells.clear()
+        return None
+
+    def _index(self, item: GridItem) -> None:
+        self._rows.setdefault(item.row, dict())[item.key] = item
+        for cell in item.cells:
+            self._cells.setdefault(cell, dict())[item.key] = item
+        return None
+
+    def _unindex(self, item: GridItem) -> None:
+        _row = self._rows.get(item.row)
+        if _row is not None:
+            _row.pop(item.key, None)
+            if len(_row) == 0:
+                del self._rows[item.row]
+        for cell in item.cells:
+            _cell = self._cells.get(cell)
+            if _cell is not None:
+                _cell.pop(item.key, None)
+                if len(_cell) == 0:
+                    del self._cells[cell]
+        return None
+
+    def add(self, item: GridItem) -> GridItem:
+        if item.key in self._items:
+            raise KeyError(f"'{item.name}' ({item.kind}) already exists")
+        self._items[item.key] = item
+        self._kinds.setdefault(item.kind, dict())[item.name] = item
+        self._index(item)
+        return item
+
+    def get(self, name: Any, kind: Optional[str] = None) -> GridItem:
+        """
+        Raises:
+            KeyError: If not found, or `kind` is None and the name is ambiguous
+        """
+        if kind is not None:
+            return self._items[(kind, name)]
+        _items = [d[name] for d in self._kinds.values() if name in d]
+        if len(_items) != 1:
+            raise KeyError(name)
+        return _items[0]
+
+    def at(self, row: int, column: int) -> List[GridItem]:
+        """Widgets covering the cell"""
+        return list(self._cells.get((row, column), dict()).values())
+
+    def in_row(self, row: int) -> List[GridItem]:
+        return sorted(self._rows.get(row, dict()).values(), key=lambda x: x.column)
+
+    def of_kind(self, kind: str) -> List[GridItem]:
+        return list(self._kinds.get(kind, dict()).values())
+
+    def rows(self) -> List[int]:
+        return sorted(self._rows.keys())
+
+    def find(
+        self,
+        row: Optional[int] = None,
+        column: Optional[int] = None,
+        kind: Optional[str] = None,
+    ) -> List[GridItem]:
+        if row is not None and column is not None:
+            _items = self.at(row, column)
+        elif row is not None:
+            _items = self.in_row(row)
+        elif kind is not None:
+            return self.of_kind(kind)
+        else:
+            _items = list(self._items.values())
+            if column is not None:
+                _items = [x for x in _items if column in range(x.column, x.column + x.columnspan)]
+        if kind is not None:
+            _items = [x for x in _items if x.kind == kind]
+        return _items
+
+    def discard(self, item: GridItem) -> None:
+        """Remove from the registry only"""
+        if self._items.get(item.key) is not item:
+            return None
+        del self._items[item.key]
+        del self._kinds[item.kind][item.name]
+        self._unindex(item)
+        return None
+
+    def remove(self, item: GridItem) -> None:
+        """Remove from the registry and its collection, and destroy the widget"""
+        self.discard(item)
+        if item.owner is not None:
+            item.owner._discard(item.name)
+        item.widget.destroy()
+        return None
+
+    def remove_at(self, row: int, column: Optional[int] = None) -> List[GridItem]:
+        """Remove widgets in the cell (or the whole row if `column` is None)"""
+        _items = self.in_row(row) if column is None else self.at(row, column)
+        for item in _items:
+            self.remove(item)
+        return _items
+
+    def _setrows(self, changes: List[Tuple[GridItem, int]]) -> None:
+        """Move items to new rows and re-grid them in one Tcl evaluation"""
+        if len(changes) == 0:
+            return None
+        for item, _ in changes:
+            self._unindex(item)
+        _pairs = []
+        for item, row in changes:
+            item.row = row
+            self._index(item)
+            _pairs += [str(item.widget), row]
+        # NOTE: hidden (grid remove) widgets stay hidden; their remembered row is updated
+        changes[0][0].widget.tk.call(
+            "apply",
+            ("pairs", """
+            foreach {w r} $pairs {
+                set shown [expr {[winfo manager $w] eq "grid"}]
+                grid configure $w -row $r
+                if {!$shown} {grid remove $w}
+            }
+            """),
+            tuple(_pairs),
+        )
+        return None
+
+    def shift_rows(self, start: int, n: int, stop: Optional[int] = None) -> List[GridItem]:
+        """Move rows in [start, stop) by n (only these widgets are re-gridded)"""
+        _rows = [r for r in self._rows.keys() if r >= start and (stop is None or r < stop)]
+        _items = [item for r in _rows for item in self._rows[r].values()]
+        self._setrows([(item, item.row + n) for item in _items])
+        return _items
+
+    def insert_rows(self, row: int, n: int = 1, gridkw: Optional[GridKw] = None) -> None:
+        """Insert n empty rows before `row`"""
+        self.shift_rows(row, n)
+        if gridkw is not None and gridkw.row >= row:
+            gridkw.row += n
+        return None
+
+    def remove_rows(self, row: int, n: int = 1, gridkw: Optional[GridKw] = None) -> List[GridItem]:
+        """Remove (destroy) widgets in n rows from `row`, and close up the rows below"""
+        _removed = []
+        for r in range(row, row + n):
+            _removed += self.remove_at(r)
+        self.shift_rows(row + n, -n)
+        if gridkw is not None and gridkw.row >= row:
+            gridkw.row = max(row, gridkw.row - n)
+        return _removed
+
+    def move_row(self, src: int, dst: int) -> None:
+        """Move a row to `dst` (rows between are shifted)"""
+        if src == dst:
+            return None
+        _moved = [(item, dst) for item in self._rows.get(src, dict()).values()]
+        if src < dst:
+            _shifted = [r for r in self._rows.keys() if src < r <= dst]
+            n = -1
+        else:
+            _shifted = [r for r in self._rows.keys() if dst <= r < src]
+            n = 1
+        _changes = [(item, item.row + n) for r in _shifted for item in self._rows[r].values()]
+        return self._setrows(_changes + _moved)
+
+    def replace(self, item: GridItem, widget: Misc) -> GridItem:
+        """Put `widget` in place of the item's widget (same name and cell)"""
+        _info = item.widget.grid_info()
+        _info.pop("in", None)
+        item.widget.destroy()
+        item.widget = widget
+        if item.owner is not None:
+            item.owner._data[item.name] = widget
+        widget.grid(**_info)
+        return item
+
+
 class _DictLikeObjects(object):
+    # Tcl procs for bulk access: (name, args, body)
+    _TCL_GETALL: Tuple[str, str, str] = (
+        "::simpletkgrid::getvars",
+        "names",
+        "set r {}; foreach n $names {lappend r [set ::$n]}; return $r",
+    )
+    _TCL_SETMANY: Tuple[str, str, str] = (
+        "::simpletkgrid::setvars",
+        "pairs",
+        "foreach {n v} $pairs {set ::$n $v}",
+    )
+    # Tcl-side dirty tracking (no Python callback per keystroke)
+    _TCL_MARKDIRTY: Tuple[str, str, str] = (
+        "::simpletkgrid::markdirty",
+        "arr var args",
+        "set ${arr}($var) 1",
+    )
+    _TCL_CLEARDIRTY: Tuple[str, str, str] = (
+        "::simpletkgrid::cleardirty",
+        "arr vars",
+        "foreach v $vars {unset -nocomplain ${arr}($v)}",
+    )
+    _count: int = 0
+
     def __init__(
         self,
         datatype,
@@ -126,6 +838,11 @@ class _DictLikeObjects(object):
         self._datatype = datatype
         self._data: Dict[Any, self._datatype] = {}
         self.defaultvalue: Optional[str] = defaultvalue
+        self._tclprocs: set = set()
+        self.trackdirty: bool = True
+        self._keyvars: Dict[Any, str] = dict()
+        _DictLikeObjects._count += 1
+        self._dirtyarray = f"::simpletkgrid::dirty{_DictLikeObjects._count}"
         if keys is not None:
             for k in keys:
                 self.add(k, **kwargs)
@@ -139,12 +856,14 @@ class _DictLikeObjects(object):
         if key in self._data.keys():
             raise KeyError(f"Key '{key}' already exists")
         self._data[key] = self._datatype(**kwargs)
+        lifecycle.track(self._data[key], "widgets" if isinstance(self._data[key], Misc) else "variables")
         if defaultvalue is None:
             defaultvalue = self.defaultvalue
         if defaultvalue is None:
             self._data[key].set(key)
         else:
             self._data[key].set(defaultvalue)
+        self._track(key)
         return None
 
     def get(self, key: Any) -> str:
@@ -162,6 +881,127 @@ class _DictLikeObjects(object):
     def items(self):
         return self._data.items()
 
+    def keys(self):
+        return self._data.keys()
+
+    def _discard(self, key: Any) -> None:
+        """Forget the key (the object is not destroyed)"""
+        self._data.pop(key, None)
+        self._keyvars.pop(key, None)
+        return None
+
+    def _clear(self) -> None:
+        """Forget all keys and Tcl-side state (on destroy)
+
+        Tcl variables are unset when their Variable objects are garbage-collected.
+        """
+        if len(self._data) > 0:
+            try:
+                self._tkapp().call("array", "unset", self._dirtyarray)
+            except TclError:
+                pass
+        self._data.clear()
+        self._keyvars.clear()
+        return None
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _tkapp(self):
+        """Tcl interpreter of the data (Variable._tk or Widget.tk)"""
+        _obj = next(iter(self._data.values()))
+        return getattr(_obj, "_tk", None) or _obj.tk
+
+    def _tclproc(self, proc: Tuple[str, str, str]):
+        """Define a Tcl proc (on first use)
+
+        Returns:
+            Tcl interpreter
+        """
+        tk = self._tkapp()
+        if proc[0] not in self._tclprocs:
+            tk.call("namespace", "eval", "::simpletkgrid", "")
+            tk.call("proc", *proc)
+            self._tclprocs.add(proc[0])
+        return tk
+
+    def _tclcall(self, proc: Tuple[str, str, str], *args) -> Any:
+        """Call a bulk-access Tcl proc"""
+        return self._tclproc(proc).call(proc[0], *args)
+
+    @staticmethod
+    def _varname(obj) -> str:
+        """Name of the Tcl variable holding the value"""
+        return str(obj)
+
+    def _track(self, key: Any) -> None:
+        """Mark `key` dirty on every write of its Tcl variable"""
+        if not self.trackdirty:
+            return None
+        _var = self._varname(self._data[key])
+        self._keyvars[key] = _var
+        tk = self._tclproc(self._TCL_MARKDIRTY)
+        tk.call(
+            "trace", "add", "variable", f"::{_var}", "write",
+            (self._TCL_MARKDIRTY[0], self._dirtyarray, _var),
+        )
+        return None
+
+    def dirty_keys(self) -> list:
+        """Keys modified (by user or program) since added or `clear_dirty()`"""
+        if len(self._keyvars) == 0:
+            return []
+        tk = self._tkapp()
+        _vars = set(tk.splitlist(tk.call("array", "names", self._dirtyarray)))
+        return [k for k, v in self._keyvars.items() if v in _vars]
+
+    def clear_dirty(self, keys: Optional[list] = None) -> None:
+        """
+        Args:
+            keys: If None, all keys
+        """
+        if len(self._keyvars) == 0:
+            return None
+        if keys is None:
+            self._tkapp().call("array", "unset", self._dirtyarray)
+        else:
+            self._tclcall(self._TCL_CLEARDIRTY, self._dirtyarray, tuple(self._keyvars[k] for k in keys))
+        return None
+
+    def get_all(self, keys: Optional[list] = None) -> Dict[Any, str]:
+        """Get values in one Tcl evaluation
+
+        Args:
+            keys: If None, all keys
+        """
+        if keys is None:
+            keys = list(self._data.keys())
+        if len(keys) == 0:
+            return dict()
+        _values = self._tclcall(self._TCL_GETALL, tuple(str(self._data[k]) for k in keys))
+        return dict(zip(keys, (str(v) for v in self._tkapp().splitlist(_values))))
+
+    def set_many(self, mapping: Dict[Any, str]) -> None:
+        """Set values in one Tcl evaluation"""
+        _pairs = []
+        for k, v in mapping.items():
+            _pairs += [str(self._data[k]), str(v)]
+        if len(_pairs) > 0:
+            self._tclcall(self._TCL_SETMANY, tuple(_pairs))
+        return None
+
+    def snapshot(self) -> Dict[Any, str]:
+        """Copy of all values (see `restore()`)"""
+        return self.get_all()
+
+    def restore(self, snapshot: Dict[Any, str]) -> None:
+        """Restore values from `snapshot()` (keys added later are kept)"""
+        return self.set_many({k: v for k, v in snapshot.items() if k in self._data})
+
+
 class StringVars(_DictLikeObjects):
     def __init__(
         self,
@@ -173,87 +1013,574 @@ class StringVars(_DictLikeObjects):
         return super().__init__(StringVar, keys=keys, defaultvalue=defaultvalue, **kwargs)
 
 
-class SettableEntry(Entry):
-    def set(self, value: str) -> None:
-        self.delete(0, END)
-        self.insert(END, value)
-        return None
-
-
-class BaseEntries(_DictLikeObjects):
+class ModelVars(object):
     def __init__(
         self,
+        master: Misc,
         keys: Union[list, tuple, set, None] = None,
         defaultvalue: Optional[str] = None,
-        **kwargs,
     ) -> None:
-        self._data: Dict[Any, SettableEntry]
-        return super().__init__(SettableEntry, keys=keys, defaultvalue=defaultvalue, **kwargs)
+        """Values kept in Python; a StringVar is created only when a widget needs one
 
+        Drop-in for StringVars in model code: `get()`/`set()` of a key without
+        a StringVar are dict operations. `self[key]` creates (materializes) the
+        StringVar for binding to widgets. Writes to materialized keys are
+        applied to Tcl in one call when the mainloop is idle (or on `flush()`),
+        and widget edits are copied back by a trace.
+        """
+        self._masterref = weakref.ref(master)
+        self.defaultvalue: Optional[str] = defaultvalue
+        self._values: Dict[Any, str] = dict()
+        self._vars: Dict[Any, StringVar] = dict()
+        self._dirty: set = set()
+        self._pending: Dict[Any, str] = dict()
+        self._afterid: Optional[str] = None
+        self._flushing: bool = False
+        if keys is not None:
+            for k in keys:
+                self.add(k)
+        return None
 
-class BaseGridObject(object):
-    def __init__(self, frame: ttk.Frame, defaultwidth: Optional[int] = None) -> None:
-        self._data: Dict[str, ttk.Widget] = dict()
-        self._nameid: int = 0
-        self.frame = frame
-        self.defaultwidth = defaultwidth
+    def add(self, key: Any, defaultvalue: Optional[str] = None) -> None:
+        if key in self._values:
+            raise KeyError(f"Key '{key}' already exists")
+        if defaultvalue is None:
+            defaultvalue = self.defaultvalue
+        self._values[key] = key if defaultvalue is None else str(defaultvalue)
         return None
 
-    def _update_kwargs(
-        self,
-        kwargs: dict,
-        gridkw: Optional[GridKw],
-        columnspan: Optional[int],
-    ) -> dict:
-        # width
-        if "width" in kwargs:
-            pass
-        elif self.defaultwidth is not None:
-            if columnspan is not None:
-                pass
-            elif gridkw is not None:
-                columnspan = gridkw.columnspan
-            else:
-                columnspan = 1
-            kwargs["width"] = self.defaultwidth * columnspan
-            if columnspan > 1:
-                kwargs["width"] += int((columnspan - 1) * 1.9)  # XXX: hardcode
-        return kwargs
+    def get(self, key: Any) -> str:
+        return self._values[key]
+
+    def set(self, key: Any, value: Any) -> None:
+        _value = str(value)
+        self._values[key] = _value
+        self._dirty.add(key)
+        if key in self._vars:
+            self._pending[key] = _value
+            self._schedule()
+        return None
 
-    def add(
-        self,
-        __object,
-        gridkw: GridKw,
-        text: Optional[str] = None,
-        name: Optional[str] = None,
-        columnspan: Optional[int] = None,
-        fullspan: bool = False,
-    ) -> None:
-        if name is None:
-            name = text
-        if type(name) is not str:
-            name = "GRIDOBJECT"  # hardcode
-        if name in self._data:
-            _unique = False
-            for _ in range(1000):
-                _name = f"{name}_{self._nameid}"
-                if _name not in self._data:
-                    _unique = True
-                    name = _name
-                    break
-                self._nameid += 1
-            if not _unique:
-                raise ValueError(f"Name '{name}' is always used")
-        self._data[name] = __object
-        self._nameid += 1
-        return self._data[name].grid(**gridkw.pull(columnspan=columnspan, fullspan=fullspan))
+    def __getitem__(self, key: Any) -> StringVar:
+        """StringVar of the key (created on first access)"""
+        _var = self._vars.get(key)
+        if _var is None:
+            self.flush()
+            _var = StringVar(self._masterref(), value=self._values[key])
+            _var.trace_add("write", partial(self._onwrite, key))
+            self._vars[key] = _var
+            lifecycle.track(_var, "variables")
+        return _var
 
+    def __contains__(self, key: Any) -> bool:
+        return key in self._values
 
-class BaseLabels(BaseGridObject):
-    def add(
-        self,
-        text: Any,
-        labelkw: LabelKw,
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def items(self):
+        return self._values.items()
+
+    def keys(self):
+        return self._values.keys()
+
+    def materialized(self, key: Any) -> bool:
+        """True if the key has a StringVar"""
+        return key in self._vars
+
+    def _onwrite(self, key: Any, *args) -> None:
+        """(trace) Copy a widget edit into the Python value"""
+        if self._flushing:
+            return None
+        self._values[key] = self._vars[key].get()
+        self._pending.pop(key, None)
+        self._dirty.add(key)
+        return None
+
+    def _schedule(self) -> None:
+        if self._afterid is None:
+            _master = self._masterref()
+            if _master is not None:
+                self._afterid = _master.after_idle(self.flush)
+        return None
+
+    def flush(self) -> None:
+        """Apply pending writes to Tcl variables in one evaluation"""
+        self._afterid = None
+        if len(self._pending) == 0:
+            return None
+        _pending, self._pending = self._pending, dict()
+        _pairs = []
+        for k, v in _pending.items():
+            _pairs += [str(self._vars[k]), v]
+        _master = self._masterref()
+        if _master is None:
+            return None
+        tk = _master.tk
+        _proc = _DictLikeObjects._TCL_SETMANY
+        if not tk.call("info", "procs", _proc[0]):
+            tk.call("namespace", "eval", "::simpletkgrid", "")
+            tk.call("proc", *_proc)
+        self._flushing = True
+        try:
+            tk.call(_proc[0], tuple(_pairs))
+        finally:
+            self._flushing = False
+        return None
+
+    def _discard(self, key: Any) -> None:
+        self._values.pop(key, None)
+        self._vars.pop(key, None)
+        self._pending.pop(key, None)
+        self._dirty.discard(key)
+        return None
+
+    def _clear(self) -> None:
+        """Forget all keys (on destroy)"""
+        _master = self._masterref()
+        if self._afterid is not None and _master is not None:
+            try:
+                _master.after_cancel(self._afterid)
+            except TclError:
+                pass
+        self._afterid = None
+        self._values.clear()
+        self._vars.clear()
+        self._pending.clear()
+        self._dirty.clear()
+        return None
+
+    # Same interface as _DictLikeObjects (e.g. for ConfigBinding)
+    def dirty_keys(self) -> list:
+        """Keys modified (by user or program) since added or `clear_dirty()`"""
+        return [k for k in self._values if k in self._dirty]
+
+    def clear_dirty(self, keys: Optional[list] = None) -> None:
+        if keys is None:
+            self._dirty.clear()
+        else:
+            self._dirty.difference_update(keys)
+        return None
+
+    def get_all(self, keys: Optional[list] = None) -> Dict[Any, str]:
+        if keys is None:
+            return self._values.copy()
+        return {k: self._values[k] for k in keys}
+
+    def set_many(self, mapping: Dict[Any, str]) -> None:
+        for k, v in mapping.items():
+            self.set(k, v)
+        return None
+
+    def snapshot(self) -> Dict[Any, str]:
+        return self._values.copy()
+
+    def restore(self, snapshot: Dict[Any, str]) -> None:
+        """Restore values from `snapshot()` (keys added later are kept)"""
+        return self.set_many({k: v for k, v in snapshot.items() if k in self._values})
+
+
+class Validator(object):
+    # Patterns (common to Tcl ARE and Python re) by type name of default value
+    PATTERNS: Dict[str, str] = {
+        "bool": r"(?i)^(true|false|1|0)$",
+        "int": r"^\s*[+-]?[0-9]+\s*$",
+        "float": r"(?i)^\s*[+-]?(([0-9]+\.?[0-9]*|\.[0-9]+)(e[+-]?[0-9]+)?|inf|infinity|nan)\s*$",
+        "list": r"^([^\[].*|\[.*\]|)$",
+        "tuple": r"^([^(].*|\(.*\)|)$",
+        "set": r"^([^{].*|\{.*\}|)$",
+        "dict": r"^(\{.*\}|[^:,]*:[^:,]*(,[^:,]*:[^:,]*)*)$",
+    }
+    _cache: Dict[str, "Validator"] = dict()
+
+    def __init__(
+        self,
+        pattern: Optional[str] = None,
+        func: Optional[Callable[[str], bool]] = None,
+        name: str = "",
+    ) -> None:
+        """Validator of entry values
+
+        A `pattern` is evaluated by Tcl (no Python call per keystroke).
+
+        Args:
+            pattern: Regular expression (Tcl ARE compatible)
+            func: func(value) -> bool
+        """
+        if (pattern is None) == (func is None):
+            raise ValueError("Either pattern or func must be given")
+        self.pattern = pattern
+        self.func = func
+        self.name = name
+        self._re = None if pattern is None else re.compile(pattern)
+        return None
+
+    @classmethod
+    def from_default(cls, default: Any) -> Optional["Validator"]:
+        """Validator for the type of a Config default value (None for str)"""
+        # NOTE: bool must come before int (same as Config._cast_value)
+        _typename = None
+        for _type in [str, bool, float, int, list, tuple, set, dict]:
+            if isinstance(default, _type):
+                _typename = _type.__name__
+                break
+        if _typename not in cls.PATTERNS:
+            return None
+        if _typename not in cls._cache:
+            cls._cache[_typename] = cls(pattern=cls.PATTERNS[_typename], name=_typename)
+        return cls._cache[_typename]
+
+    def __call__(self, value: str) -> bool:
+        if self._re is not None:
+            return self._re.search(value) is not None
+        return bool(self.func(value))
+
+
+class SettableEntry(Entry):
+    def __init__(self, master=None, cnf={}, **kw) -> None:
+        # textvariable is used for dirty tracking
+        if "textvariable" not in kw:
+            kw["textvariable"] = StringVar(master=master)
+        self.variable: Variable = kw["textvariable"]
+        self.autocomplete: Optional[Autocomplete] = None
+        return super().__init__(master, cnf, **kw)
+
+    def set(self, value: str) -> None:
+        self.delete(0, END)
+        self.insert(END, value)
+        return None
+
+
+class Autocomplete(object):
+    # keys which do not change the text
+    _NAVKEYS = frozenset(("Up", "Down", "Return", "KP_Enter", "Escape", "Tab", "Left", "Right", "Home", "End"))
+
+    def __init__(
+        self,
+        entry: Entry,
+        source: Union[Iterable[str], Callable[[], Iterable[str]], "ChoiceIndex"],
+        topk: int = AUTOCOMPLETE_TOPK,
+        substring: bool = False,
+    ) -> None:
+        """Popup list of suggestions for an Entry
+
+        The index (ChoiceIndex) is built on a worker thread; suggestions
+        are shown once it is ready. Each keystroke is one lookup of the top `topk`
+        matches (binary search for prefixes, see ChoiceIndex).
+
+        Args:
+            source: options, func() -> options (called on the worker thread), or a built ChoiceIndex
+            substring: If True, also suggest options containing the text
+        """
+        self.entry = entry
+        self.topk: int = topk
+        self.substring: bool = substring
+        self.index: Optional[ChoiceIndex] = None
+        self._popup: Optional[Toplevel] = None
+        self._listbox: Optional[Listbox] = None
+        self._shown: List[str] = []
+        if isinstance(source, ChoiceIndex):
+            self.index = source
+        else:
+            from threading import Thread
+            Thread(target=self._build, args=(source,), daemon=True).start()
+        entry.bind("<KeyRelease>", self._update, add="+")
+        entry.bind("<Down>", lambda e: self._move(1))
+        entry.bind("<Up>", lambda e: self._move(-1))
+        entry.bind("<Return>", self._accept, add="+")
+        entry.bind("<Escape>", self._escape)
+        entry.bind("<FocusOut>", lambda e: self.entry.after(100, self.hide), add="+")
+        return None
+
+    def _build(self, source) -> None:
+        """(worker thread)"""
+        if callable(source):
+            source = source()
+        # NOTE: attribute assignment is atomic; the Tk thread sees None or a complete index
+        self.index = ChoiceIndex(source)
+        return None
+
+    @property
+    def ready(self) -> bool:
+        return self.index is not None
+
+    def suggest(self, text: str) -> List[str]:
+        if self.index is None or len(text) == 0:
+            return []
+        if self.substring:
+            _indices = self.index.search(text, self.topk)
+        else:
+            _indices = self.index.prefix(text, self.topk)
+        return [self.index.options[i] for i in _indices]
+
+    def _update(self, event=None) -> None:
+        if event is not None and event.keysym in self._NAVKEYS:
+            return None
+        self._shown = self.suggest(self.entry.get())
+        if len(self._shown) == 0 or self._shown == [self.entry.get()]:
+            self.hide()
+        else:
+            self.show()
+        return None
+
+    def show(self) -> None:
+        if self._popup is None:
+            self._popup = Toplevel(self.entry)
+            self._popup.withdraw()
+            self._popup.overrideredirect(True)
+            self._listbox = Listbox(self._popup, exportselection=False, activestyle="none")
+            self._listbox.pack(fill="both", expand=True)
+            self._listbox.bind("<ButtonRelease-1>", self._accept)
+        self._listbox.delete(0, END)
+        self._listbox.insert(END, *self._shown)
+        self._listbox.configure(height=len(self._shown), width=max(self.entry.cget("width"), 1))
+        self._popup.geometry(
+            f"+{self.entry.winfo_rootx()}+{self.entry.winfo_rooty() + self.entry.winfo_height()}"
+        )
+        self._popup.deiconify()
+        self._popup.lift()
+        return None
+
+    def hide(self) -> None:
+        if self._popup is not None:
+            self._popup.withdraw()
+        self._shown = []
+        return None
+
+    @property
+    def visible(self) -> bool:
+        return len(self._shown) > 0
+
+    def _move(self, step: int) -> Optional[str]:
+        if not self.visible:
+            return None
+        _selection = self._listbox.curselection()
+        j = -1 if len(_selection) == 0 else _selection[0]
+        j = min(max(j + step, 0), len(self._shown) - 1)
+        self._listbox.selection_clear(0, END)
+        self._listbox.selection_set(j)
+        self._listbox.see(j)
+        return "break"
+
+    def _accept(self, event=None) -> Optional[str]:
+        if not self.visible:
+            return None
+        _selection = self._listbox.curselection()
+        if len(_selection) == 0:
+            # Return without choosing: keep the typed text
+            self.hide()
+            return None
+        _value = self._shown[_selection[0]]
+        self.hide()
+        self.entry.delete(0, END)
+        self.entry.insert(END, _value)
+        self.entry.icursor(END)
+        self.entry.focus_set()
+        return "break"
+
+    def _escape(self, event=None) -> Optional[str]:
+        if not self.visible:
+            return None
+        self.hide()
+        return "break"
+
+
+class BaseEntries(_DictLikeObjects):
+    _TCL_GETALL: Tuple[str, str, str] = (
+        "::simpletkgrid::getentries",
+        "ws",
+        "set r {}; foreach w $ws {lappend r [$w get]}; return $r",
+    )
+    _TCL_SETMANY: Tuple[str, str, str] = (
+        "::simpletkgrid::setentries",
+        "pairs",
+        "foreach {w v} $pairs {$w delete 0 end; $w insert end $v}",
+    )
+
+    def __init__(
+        self,
+        keys: Union[list, tuple, set, None] = None,
+        defaultvalue: Optional[str] = None,
+        **kwargs,
+    ) -> None:
+        self._data: Dict[Any, SettableEntry]
+        return super().__init__(SettableEntry, keys=keys, defaultvalue=defaultvalue, **kwargs)
+
+    # Validation (shows invalid state with INVALID_BACKGROUND)
+    _TCL_MARKVALID: Tuple[str, str, str] = (
+        "::simpletkgrid::markvalid",
+        "w ok",
+        """
+        variable invalid
+        if {$ok} {
+            if {[info exists invalid($w)]} {
+                $w configure -background $invalid($w)
+                unset invalid($w)
+            }
+        } elseif {![info exists invalid($w)]} {
+            set invalid($w) [$w cget -background]
+            $w configure -background $::simpletkgrid::invalidbg
+        }
+        return 1
+        """,
+    )
+    _TCL_VALIDATE: Tuple[str, str, str] = (
+        "::simpletkgrid::validate",
+        "w pattern value",
+        "::simpletkgrid::markvalid $w [regexp -- $pattern $value]",
+    )
+
+    @staticmethod
+    def _varname(obj: SettableEntry) -> str:
+        return str(obj.variable)
+
+    def set_validator(
+        self,
+        key: Any,
+        validator: Union[Validator, Callable[[str], bool], None],
+    ) -> None:
+        """Validate on every edit and show invalid state
+
+        Args:
+            validator: Validator (e.g. `Validator.from_default(config.default[section][key])`),
+                func(value) -> bool, or None (disable)
+        """
+        entry = self._data[key]
+        if validator is None:
+            entry.configure(validate="none", validatecommand="")
+            self._tclproc(self._TCL_MARKVALID).call(self._TCL_MARKVALID[0], str(entry), 1)
+            return None
+        if not isinstance(validator, Validator):
+            validator = Validator(func=validator)
+        tk = self._tclproc(self._TCL_MARKVALID)
+        tk.call("set", "::simpletkgrid::invalidbg", INVALID_BACKGROUND)
+        if validator.pattern is not None:
+            self._tclproc(self._TCL_VALIDATE)
+            vcmd = (self._TCL_VALIDATE[0], "%W", validator.pattern, "%P")
+            tk.call(self._TCL_VALIDATE[0], str(entry), validator.pattern, entry.get())
+        else:
+            def _validate(w: str, value: str) -> bool:
+                return tk.call(self._TCL_MARKVALID[0], w, int(validator(value)))
+            vcmd = (entry.register(_validate), "%W", "%P")
+            _validate(str(entry), entry.get())
+        entry.configure(validate="key", validatecommand=vcmd)
+        return None
+
+    def _clear(self) -> None:
+        if len(self._data) > 0:
+            try:
+                self._tkapp().call(
+                    "apply",
+                    ("ws", "foreach w $ws {unset -nocomplain ::simpletkgrid::invalid($w)}"),
+                    tuple(str(x) for x in self._data.values()),
+                )
+            except TclError:
+                pass
+        return super()._clear()
+
+    def invalid_keys(self) -> list:
+        """Keys whose value is invalid now"""
+        if len(self._data) == 0:
+            return []
+        tk = self._tkapp()
+        if not int(tk.call("info", "exists", "::simpletkgrid::invalid")):
+            return []
+        _ws = set(tk.splitlist(tk.call("array", "names", "::simpletkgrid::invalid")))
+        return [k for k, v in self._data.items() if str(v) in _ws]
+
+
+class BaseGridObject(object):
+    kind: str = "gridobject"
+
+    def __init__(self, frame: ttk.Frame, defaultwidth: Optional[int] = None) -> None:
+        self._data: Dict[str, ttk.Widget] = dict()
+        # next suffix of each name (for unique names)
+        self._nameids: Dict[str, int] = dict()
+        self.frame = frame
+        self.defaultwidth = defaultwidth
+        self.registry: Optional[WidgetRegistry] = None
+        return None
+
+    def _uniquename(self, name: str) -> str:
+        if name not in self._data:
+            return name
+        _id = self._nameids.get(name, 0)
+        while f"{name}_{_id}" in self._data:
+            _id += 1
+        self._nameids[name] = _id + 1
+        return f"{name}_{_id}"
+
+    def _discard(self, name: str) -> None:
+        """Forget the name (the widget is not destroyed)"""
+        self._data.pop(name, None)
+        return None
+
+    def __getitem__(self, name: str):
+        return self._data[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._data
+
+    def _clear(self) -> None:
+        """Forget all widgets (on destroy)"""
+        self._data.clear()
+        self._nameids.clear()
+        return None
+
+    def _update_kwargs(
+        self,
+        kwargs: dict,
+        gridkw: Optional[GridKw],
+        columnspan: Optional[int],
+    ) -> dict:
+        # width
+        if "width" in kwargs:
+            pass
+        elif self.defaultwidth is not None:
+            if columnspan is not None:
+                pass
+            elif gridkw is not None:
+                columnspan = gridkw.columnspan
+            else:
+                columnspan = 1
+            kwargs["width"] = self.defaultwidth * columnspan
+            if columnspan > 1:
+                kwargs["width"] += int((columnspan - 1) * 1.9)  # XXX: hardcode
+        return kwargs
+
+    def add(
+        self,
+        __object,
+        gridkw: GridKw,
+        text: Optional[str] = None,
+        name: Optional[str] = None,
+        columnspan: Optional[int] = None,
+        fullspan: bool = False,
+    ) -> None:
+        if name is None:
+            name = text
+        if type(name) is not str:
+            name = "GRIDOBJECT"  # hardcode
+        name = self._uniquename(name)
+        self._data[name] = __object
+        lifecycle.track(__object, "widgets")
+        _gridargs = gridkw.pull(columnspan=columnspan, fullspan=fullspan)
+        if self.registry is not None:
+            self.registry.add(GridItem(
+                self.kind, name, __object,
+                _gridargs["row"], _gridargs["column"], _gridargs["columnspan"],
+                owner=self,
+            ))
+        return self._data[name].grid(**_gridargs)
+
+
+class BaseLabels(BaseGridObject):
+    kind: str = "label"
+
+    def add(
+        self,
+        text: Any,
+        labelkw: LabelKw,
         gridkw: GridKw,
         name: Optional[str] = None,
         columnspan: Optional[int] = None,
@@ -275,6 +1602,8 @@ class BaseLabels(BaseGridObject):
 
 
 class BaseButtons(BaseGridObject):
+    kind: str = "button"
+
     def add(
         self,
         text: str,
@@ -290,11 +1619,14 @@ class BaseButtons(BaseGridObject):
             **kwargs: ttk.Button(**kwargs)
         """
         kwargs = self._update_kwargs(kwargs, gridkw=gridkw, columnspan=columnspan)
+        command = _wrap_command(self.frame, command, name=f"Button[{text}]")
         _obj = ttk.Button(self.frame, text=text, command=command, **kwargs)
         return super().add(_obj, gridkw=gridkw, text=text, name=name, columnspan=columnspan, fullspan=fullspan)
 
 
 class BaseRadioButtons(BaseGridObject):
+    kind: str = "radiobutton"
+
     def add(
             self,
             text: str,
@@ -311,14 +1643,23 @@ class BaseRadioButtons(BaseGridObject):
             **kwargs: ttk.Radiobutton(**kwargs)
         """
         kwargs = self._update_kwargs(kwargs, gridkw=gridkw, columnspan=columnspan)
+        if "command" in kwargs:
+            kwargs["command"] = _wrap_command(self.frame, kwargs["command"], name=f"RadioButton[{text}]")
         _obj = ttk.Radiobutton(self.frame, text=text, variable=variable, value=value, **kwargs)
         return super().add(_obj, gridkw=gridkw, text=text, name=name, columnspan=columnspan, fullspan=fullspan)
 
 
 class Labels(BaseLabels):
-    def __init__(self, frame: ttk.Frame, gridkw: GridKw, labelkw: LabelKw) -> None:
+    def __init__(
+        self,
+        frame: ttk.Frame,
+        gridkw: GridKw,
+        labelkw: LabelKw,
+        fonts: Optional[FontRegistry] = None,
+    ) -> None:
         self._gridkw = gridkw
         self._labelkw = labelkw
+        self._fonts = fonts
         return super().__init__(frame)
     def add(
         self,
@@ -331,112 +1672,1537 @@ class Labels(BaseLabels):
         fontscale: Union[float, str, None] = None,  # get_customized
         **kwargs,
     ) -> None:
-        if labelkw is None:
-            labelkw = self._labelkw
-        return super().add(text, labelkw.get_customized(font=font, fontscale=fontscale), self._gridkw, name, columnspan, fullspan, **kwargs)
+        if labelkw is not None or self._fonts is None or "style" in kwargs:
+            if labelkw is None:
+                labelkw = self._labelkw
+            _labelkw = labelkw.get_customized(font=font, fontscale=fontscale)
+        else:
+            # shared style (see FontRegistry)
+            _labelkw = dict(style=self._fonts.style(font, fontscale))
+        return super().add(text, _labelkw, self._gridkw, name, columnspan, fullspan, **kwargs)
+
+
+class Buttons(BaseButtons):
+    def __init__(self, frame: ttk.Frame, gridkw: GridKw) -> None:
+        self._gridkw = gridkw
+        return super().__init__(frame)
+    def add(
+        self,
+        text: str,
+        command,
+        name: Optional[str] = None,
+        columnspan: Optional[int] = None,
+        fullspan: bool = False,
+        **kwargs,
+    ) -> None:
+        return super().add(text, command, self._gridkw, name, columnspan, fullspan, **kwargs)
+
+
+class RadioButtons(BaseRadioButtons):
+    def __init__(self, frame: ttk.Frame, gridkw: GridKw) -> None:
+        self._gridkw = gridkw
+        return super().__init__(frame)
+    def add(
+        self,
+        text: str,
+        value: Any,
+        variable: Variable,
+        name: str = None,
+        columnspan: Optional[int] = None,
+        fullspan: bool = False,
+        **kwargs,
+    ) -> None:
+        return super().add(text, value, variable, self._gridkw, name, columnspan, fullspan, **kwargs)
+
+
+class Entries(BaseEntries):
+    kind: str = "entry"
+
+    def __init__(
+        self,
+        frame: ttk.Frame,
+        gridkw: GridKw,
+        keys: Union[list, tuple, set, None] = None,
+        defaultvalue: Optional[str] = None,
+        **kwargs,
+    ) -> None:
+        self._data: Dict[Any, SettableEntry]
+        self._frame = frame
+        self._gridkw = gridkw
+        self.defaultwidth: int = 80
+        self.registry: Optional[WidgetRegistry] = None
+        return super().__init__(keys, defaultvalue, **kwargs)
+    def add(
+        self,
+        key: Any,  # set
+        value: str,  # set
+        defaultvalue: Optional[str] = None,  # not used (overwritten by value)
+        width: Optional[int] = None,  # BaseEntries
+        validator: Union[Validator, Callable[[str], bool], None] = None,  # set_validator
+        suggestions: Union[Iterable[str], Callable[[], Iterable[str]], "ChoiceIndex", None] = None,  # Autocomplete
+        **kwargs,  # Entry
+    ) -> None:
+        if width is None:
+            width = self.defaultwidth
+        # NOTE: value is set before dirty tracking starts
+        _ret =  super().add(key, value, width=width, master=self._frame, **kwargs)
+        if validator is not None:
+            self.set_validator(key, validator)
+        if suggestions is not None:
+            self._data[key].autocomplete = Autocomplete(self._data[key], suggestions)
+        _gridargs = self._gridkw.pull(fullspan=True)
+        if self.registry is not None:
+            self.registry.add(GridItem(
+                self.kind, key, self._data[key],
+                _gridargs["row"], _gridargs["column"], _gridargs["columnspan"],
+                owner=self,
+            ))
+        self._data[key].grid(**_gridargs)
+        return _ret
+
+
+class Console(ttk.Frame):
+    def __init__(
+        self,
+        master: Misc,
+        maxlines: int = CONSOLE_MAXLINES,
+        interval: int = CONSOLE_INTERVAL,
+        width: int = 80,
+        height: int = 20,
+        **kwargs,  # Text
+    ) -> None:
+        """Read-only append-only text console
+
+        `write()` can be called from any thread. Written text is buffered and
+        inserted once per `interval` ms, and only the last `maxlines` lines are kept.
+        The view follows new lines only while it is scrolled to the bottom.
+        """
+        from threading import Lock
+        _ret = super().__init__(master)
+        self.maxlines: int = maxlines
+        self.interval: int = interval
+        self.text = Text(self, width=width, height=height, state="disabled", **kwargs)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.text.yview)
+        self.text.configure(yscrollcommand=self.scrollbar.set)
+        self.text.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        self._lock = Lock()
+        self._pending: List[str] = []
+        self._afterid: Optional[str] = self.after(self.interval, self._poll)
+        return _ret
+
+    def write(self, s: str) -> int:
+        """Append text (thread-safe, file-like)"""
+        with self._lock:
+            self._pending.append(s)
+        return len(s)
+
+    def flush(self) -> None:
+        """File-like (written text is flushed by the Tk thread)"""
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending = []
+        self.text.configure(state="normal")
+        self.text.delete("1.0", END)
+        self.text.configure(state="disabled")
+        return None
+
+    def _poll(self) -> None:
+        self._afterid = None
+        if len(self._pending) > 0:
+            self._flush()
+        self._afterid = self.after(self.interval, self._poll)
+        return None
+
+    def _flush(self) -> None:
+        with self._lock:
+            _pending, self._pending = self._pending, []
+        _chunk = "".join(_pending)
+        if len(_chunk) == 0:
+            return None
+        # drop lines which would be trimmed anyway
+        _n = _chunk.count("\n")
+        if _n > self.maxlines:
+            _chunk = _chunk.split("\n", _n - self.maxlines)[-1]
+        _pinned = self.text.yview()[1] >= 1.0
+        self.text.configure(state="normal")
+        self.text.insert(END, _chunk)
+        # trim from the top (ring buffer)
+        _lines = int(self.text.index("end-1c").split(".")[0])
+        if _lines > self.maxlines:
+            self.text.delete("1.0", f"{_lines - self.maxlines + 1}.0")
+        self.text.configure(state="disabled")
+        if _pinned:
+            self.text.yview_moveto(1.0)
+        return None
+
+    def destroy(self) -> None:
+        if self._afterid is not None:
+            self.after_cancel(self._afterid)
+            self._afterid = None
+        return super().destroy()
+
+
+class BaseConsoles(BaseGridObject):
+    kind: str = "console"
+
+    def add(
+        self,
+        gridkw: GridKw,
+        name: Optional[str] = None,
+        columnspan: Optional[int] = None,
+        fullspan: bool = True,
+        **kwargs,
+    ) -> None:
+        """
+        Args:
+            **kwargs: Console(**kwargs)
+        """
+        kwargs = self._update_kwargs(kwargs, gridkw=gridkw, columnspan=columnspan)
+        _obj = Console(self.frame, **kwargs)
+        if name is None:
+            name = "console"
+        return super().add(_obj, gridkw=gridkw, name=name, columnspan=columnspan, fullspan=fullspan)
+
+
+class Consoles(BaseConsoles):
+    def __init__(self, frame: ttk.Frame, gridkw: GridKw) -> None:
+        self._gridkw = gridkw
+        return super().__init__(frame)
+    def add(
+        self,
+        name: Optional[str] = None,
+        columnspan: Optional[int] = None,
+        fullspan: bool = True,
+        **kwargs,
+    ) -> None:
+        return super().add(self._gridkw, name, columnspan, fullspan, **kwargs)
+
+    def write(self, name: str, s: str) -> int:
+        """Thread-safe"""
+        return self._data[name].write(s)
+
+
+class _Series(object):
+    __slots__ = ("name", "color", "item", "data", "count", "k", "b0", "buckets")
+
+    def __init__(self, name: str, color: str, item: int, capacity: int, k: int) -> None:
+        """Ring buffer of samples and min/max of every `k` samples (see Chart)"""
+        from array import array
+        self.name = name
+        self.color = color
+        self.item = item
+        self.data = array("d", bytes(8 * capacity))
+        self.count: int = 0  # number of samples ever appended
+        self.k: int = k
+        self.b0: int = 0  # bucket index of buckets[0]
+        self.buckets: List[List[float]] = []
+        return None
+
+    def append(self, value: float) -> None:
+        _capacity = len(self.data)
+        i = self.count
+        self.data[i % _capacity] = value
+        self.count += 1
+        b = i // self.k
+        if len(self.buckets) > 0 and self.b0 + len(self.buckets) - 1 == b:
+            _bucket = self.buckets[-1]
+            if value < _bucket[0]:
+                _bucket[0] = value
+            elif value > _bucket[1]:
+                _bucket[1] = value
+        else:
+            if len(self.buckets) == 0:
+                self.b0 = b
+            self.buckets.append([value, value])
+        # drop buckets out of the window
+        _first = max(0, self.count - _capacity) // self.k
+        if self.b0 < _first:
+            del self.buckets[:_first - self.b0]
+            self.b0 = _first
+        return None
+
+    def values(self) -> List[float]:
+        """Retained samples (oldest first)"""
+        _capacity = len(self.data)
+        if self.count <= _capacity:
+            return self.data[:self.count].tolist()
+        i = self.count % _capacity
+        return (self.data[i:] + self.data[:i]).tolist()
+
+    def rebuild(self, k: int) -> None:
+        """Recompute buckets for `k` samples per bucket (O(capacity))"""
+        _values = self.values()
+        self.k = k
+        # replay the retained samples
+        self.count -= len(_values)
+        self.buckets = []
+        for v in _values:
+            self.append(v)
+        return None
+
+
+class Chart(Canvas):
+    def __init__(
+        self,
+        master: Misc,
+        series: Iterable[str] = ("value",),
+        capacity: int = CHART_CAPACITY,
+        ylim: Tuple[Optional[float], Optional[float]] = (None, None),
+        interval: int = CHART_INTERVAL,
+        width: int = 400,
+        height: int = 150,
+        pad: int = 4,
+        **kwargs,  # Canvas
+    ) -> None:
+        """Live time-series chart of the last `capacity` samples
+
+        `append()` can be called from any thread and costs O(1).
+        Samples are reduced to min/max per pixel column as they arrive,
+        so a redraw (at most once per `interval` ms) costs O(width).
+        Canvas items are created once and updated in place.
+
+        Args:
+            ylim: (ymin, ymax); None is autoscaled
+        """
+        from threading import Lock
+        kwargs.setdefault("background", "white")
+        kwargs.setdefault("highlightthickness", 0)
+        _ret = super().__init__(master, width=width, height=height, **kwargs)
+        self.capacity: int = capacity
+        self.ylim = ylim
+        self.interval: int = interval
+        self.pad: int = pad
+        self._width: int = width
+        self._height: int = height
+        self._lock = Lock()
+        self._dirty: bool = False
+        self._series: Dict[str, _Series] = dict()
+        self._ytext = (
+            self.create_text(pad, pad, anchor="nw", fill="gray"),
+            self.create_text(pad, height - pad, anchor="sw", fill="gray"),
+        )
+        for name in series:
+            self.add_series(name)
+        self.bind("<Configure>", self._onresize, add="+")
+        self._afterid: Optional[str] = self.after(self.interval, self._poll)
+        return _ret
+
+    def _k(self) -> int:
+        """Samples per pixel column"""
+        return max(1, -(-self.capacity // max(self._width - 2 * self.pad, 1)))
+
+    def add_series(self, name: str, color: Optional[str] = None) -> None:
+        if name in self._series:
+            raise KeyError(f"Series '{name}' already exists")
+        if color is None:
+            color = CHART_COLORS[len(self._series) % len(CHART_COLORS)]
+        _item = self.create_line(0, 0, 0, 0, fill=color, state="hidden")
+        with self._lock:
+            self._series[name] = _Series(name, color, _item, self.capacity, self._k())
+        return None
+
+    def append(self, value: float, series: Optional[str] = None) -> None:
+        """Add a sample (thread-safe)
+
+        Args:
+            series: If None, the first series
+        """
+        with self._lock:
+            if series is None:
+                _series = next(iter(self._series.values()))
+            else:
+                _series = self._series[series]
+            _series.append(float(value))
+            self._dirty = True
+        return None
+
+    def extend(self, values: Iterable[float], series: Optional[str] = None) -> None:
+        """Add samples (thread-safe)"""
+        with self._lock:
+            if series is None:
+                _series = next(iter(self._series.values()))
+            else:
+                _series = self._series[series]
+            for v in values:
+                _series.append(float(v))
+            self._dirty = True
+        return None
+
+    def values(self, series: Optional[str] = None) -> List[float]:
+        with self._lock:
+            if series is None:
+                return next(iter(self._series.values())).values()
+            return self._series[series].values()
+
+    def clear(self) -> None:
+        with self._lock:
+            for _series in self._series.values():
+                _series.count = 0
+                _series.buckets = []
+            self._dirty = True
+        return None
+
+    def _onresize(self, event) -> None:
+        if (event.width, event.height) == (self._width, self._height):
+            return None
+        self._width, self._height = event.width, event.height
+        _k = self._k()
+        with self._lock:
+            for _series in self._series.values():
+                if _series.k != _k:
+                    _series.rebuild(_k)
+            self._dirty = True
+        return None
+
+    def _poll(self) -> None:
+        self._afterid = None
+        if self._dirty:
+            self.redraw()
+        self._afterid = self.after(self.interval, self._poll)
+        return None
+
+    def redraw(self) -> None:
+        """Update canvas items (Tk thread)"""
+        with self._lock:
+            self._dirty = False
+            # copy O(width) data, draw outside the lock
+            _data = [
+                (_series.item, max(0, _series.count - self.capacity) // _series.k, _series.b0,
+                 [tuple(x) for x in _series.buckets], _series.k)
+                for _series in self._series.values()
+            ]
+        _ymin, _ymax = self.ylim
+        if _ymin is None:
+            _ymin = min((b[0] for d in _data for b in d[3]), default=0.0)
+        if _ymax is None:
+            _ymax = max((b[1] for d in _data for b in d[3]), default=1.0)
+        if _ymax <= _ymin:
+            _ymin, _ymax = _ymin - 0.5, _ymax + 0.5
+        _pad = self.pad
+        _w = self._width - 2 * _pad
+        _h = self._height - 2 * _pad
+        _yscale = _h / (_ymax - _ymin)
+        _ybottom = self._height - _pad
+        for _item, _first, _b0, _buckets, _k in _data:
+            if len(_buckets) == 0:
+                self.itemconfigure(_item, state="hidden")
+                continue
+            _dx = _w / -(-self.capacity // _k)
+            _coords: List[float] = []
+            for j, (lo, hi) in enumerate(_buckets):
+                x = _pad + (_b0 + j - _first) * _dx
+                _coords += (x, _ybottom - (hi - _ymin) * _yscale, x, _ybottom - (lo - _ymin) * _yscale)
+            if len(_coords) == 4:
+                _coords += _coords
+            self.coords(_item, _coords)
+            self.itemconfigure(_item, state="normal")
+        self.itemconfigure(self._ytext[0], text=f"{_ymax:.4g}")
+        self.coords(self._ytext[1], _pad, _ybottom)
+        self.itemconfigure(self._ytext[1], text=f"{_ymin:.4g}")
+        return None
+
+    def destroy(self) -> None:
+        if self._afterid is not None:
+            self.after_cancel(self._afterid)
+            self._afterid = None
+        return super().destroy()
+
+
+class BaseCharts(BaseGridObject):
+    kind: str = "chart"
+
+    def add(
+        self,
+        gridkw: GridKw,
+        name: Optional[str] = None,
+        columnspan: Optional[int] = None,
+        fullspan: bool = True,
+        **kwargs,
+    ) -> None:
+        """
+        Args:
+            **kwargs: Chart(**kwargs)
+        """
+        _obj = Chart(self.frame, **kwargs)
+        if name is None:
+            name = "chart"
+        return super().add(_obj, gridkw=gridkw, name=name, columnspan=columnspan, fullspan=fullspan)
+
+
+class Charts(BaseCharts):
+    def __init__(self, frame: ttk.Frame, gridkw: GridKw) -> None:
+        self._gridkw = gridkw
+        return super().__init__(frame)
+    def add(
+        self,
+        name: Optional[str] = None,
+        columnspan: Optional[int] = None,
+        fullspan: bool = True,
+        **kwargs,
+    ) -> None:
+        return super().add(self._gridkw, name, columnspan, fullspan, **kwargs)
+
+    def append(self, name: str, value: float, series: Optional[str] = None) -> None:
+        """Thread-safe"""
+        return self._data[name].append(value, series=series)
+
+
+def _format_seconds(seconds: float) -> str:
+    seconds = int(seconds + 0.5)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+class Progress(ttk.Frame):
+    def __init__(
+        self,
+        master: Misc,
+        total: Optional[float] = None,
+        fps: float = PROGRESS_FPS,
+        unit: str = "",
+        length: int = 300,
+        **kwargs,  # ttk.Frame
+    ) -> None:
+        """Progress bar with throughput and ETA
+
+        `advance()`/`set()` can be called from any thread and only update counters.
+        The bar and the text are redrawn at most `fps` times per second.
+
+        Args:
+            total: If None, indeterminate mode
+            unit: Unit of throughput (e.g. "files")
+        """
+        from threading import Lock
+        from time import monotonic
+        _ret = super().__init__(master, **kwargs)
+        self.fps: float = fps
+        self.unit: str = unit
+        self.bar = ttk.Progressbar(self, orient="horizontal", length=length)
+        self.label = ttk.Label(self)
+        self.bar.grid(row=0, column=0, sticky="ew")
+        self.label.grid(row=0, column=1, sticky=W, padx=(8, 0))
+        self.columnconfigure(0, weight=1)
+        self._lock = Lock()
+        self.done: float = 0
+        self.total: Optional[float] = total
+        self._dirty: bool = True
+        self._t0: float = monotonic()
+        self._last: Tuple[float, float] = (self._t0, 0)  # (time, done) of the last redraw
+        self.rate: Optional[float] = None  # per second (smoothed)
+        self._mode: Optional[str] = None
+        self._afterid: Optional[str] = self.after(self._interval(), self._poll)
+        return _ret
+
+    def _interval(self) -> int:
+        return max(int(1000 / self.fps), 1)
+
+    def advance(self, n: float = 1) -> None:
+        """Thread-safe"""
+        with self._lock:
+            self.done += n
+            self._dirty = True
+        return None
+
+    def set(self, done: float, total: Optional[float] = None) -> None:
+        """Thread-safe"""
+        with self._lock:
+            self.done = done
+            if total is not None:
+                self.total = total
+            self._dirty = True
+        return None
+
+    def reset(self, total: Optional[float] = None) -> None:
+        """Thread-safe"""
+        from time import monotonic
+        with self._lock:
+            self.done = 0
+            self.total = total
+            self._t0 = monotonic()
+            self._last = (self._t0, 0)
+            self.rate = None
+            self._dirty = True
+        return None
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Remaining seconds (None if unknown)"""
+        if self.total is None or self.rate is None or self.rate <= 0:
+            return None
+        return max(self.total - self.done, 0) / self.rate
+
+    def _poll(self) -> None:
+        self._afterid = None
+        self.redraw()
+        self._afterid = self.after(self._interval(), self._poll)
+        return None
+
+    def redraw(self) -> None:
+        """(Tk thread)"""
+        from time import monotonic
+        _now = monotonic()
+        with self._lock:
+            if not self._dirty and (self.total is None or self.done >= self.total):
+                return None
+            self._dirty = False
+            _done, _total = self.done, self.total
+            _t, _d = self._last
+            # throughput: exponential moving average (about 1s)
+            if _now > _t:
+                _rate = (_done - _d) / (_now - _t)
+                _alpha = min((_now - _t) / 1.0, 1.0)
+                self.rate = _rate if self.rate is None else self.rate + _alpha * (_rate - self.rate)
+            self._last = (_now, _done)
+            _rate = self.rate
+            _eta = self.eta
+        _mode = "indeterminate" if _total is None else "determinate"
+        if _mode != self._mode:
+            self.bar.stop()
+            self.bar.configure(mode=_mode)
+            if _mode == "indeterminate":
+                self.bar.start(self._interval())
+            self._mode = _mode
+        _text = f"{_done:g}" if _total is None else f"{_done:g}/{_total:g}"
+        if _rate is not None:
+            _text += f"  {_rate:.3g} {self.unit}/s" if len(self.unit) > 0 else f"  {_rate:.3g}/s"
+        if _total is not None:
+            self.bar.configure(maximum=max(_total, 1e-9), value=min(_done, _total))
+            if _done >= _total:
+                _text += f"  {_format_seconds(_now - self._t0)}"
+            elif _eta is not None:
+                _text += f"  ETA {_format_seconds(_eta)}"
+        self.label.configure(text=_text)
+        return None
+
+    def destroy(self) -> None:
+        if self._afterid is not None:
+            self.after_cancel(self._afterid)
+            self._afterid = None
+        return super().destroy()
+
+
+class BaseProgressBars(BaseGridObject):
+    kind: str = "progressbar"
+
+    def add(
+        self,
+        gridkw: GridKw,
+        name: Optional[str] = None,
+        columnspan: Optional[int] = None,
+        fullspan: bool = True,
+        **kwargs,
+    ) -> None:
+        """
+        Args:
+            **kwargs: Progress(**kwargs)
+        """
+        _obj = Progress(self.frame, **kwargs)
+        if name is None:
+            name = "progress"
+        return super().add(_obj, gridkw=gridkw, name=name, columnspan=columnspan, fullspan=fullspan)
+
+
+class ProgressBars(BaseProgressBars):
+    def __init__(self, frame: ttk.Frame, gridkw: GridKw) -> None:
+        self._gridkw = gridkw
+        return super().__init__(frame)
+    def add(
+        self,
+        name: Optional[str] = None,
+        columnspan: Optional[int] = None,
+        fullspan: bool = True,
+        **kwargs,
+    ) -> None:
+        return super().add(self._gridkw, name, columnspan, fullspan, **kwargs)
+
+    def advance(self, name: str, n: float = 1) -> None:
+        """Thread-safe"""
+        return self._data[name].advance(n)
+
+    def set(self, name: str, done: float, total: Optional[float] = None) -> None:
+        """Thread-safe"""
+        return self._data[name].set(done, total)
+
+
+class ChoiceIndex(object):
+    def __init__(self, options: Iterable[str]) -> None:
+        """Case-insensitive prefix/substring index of options
+
+        Prefix lookup is a binary search over the sorted keys.
+        Substring lookup runs str.find() over all keys joined into one string,
+        so it stops as soon as `limit` matches are found.
+        """
+        from array import array
+        self.options: List[str] = list(options)
+        _keys = [x.casefold().replace("\n", " ") for x in self.options]
+        self._order: List[int] = sorted(range(len(_keys)), key=_keys.__getitem__)
+        self._sortedkeys: List[str] = [_keys[i] for i in self._order]
+        self._text: str = "\n".join(_keys)
+        self._offsets = array("q", [0] * (len(_keys) + 1))
+        _pos = 0
+        for i, k in enumerate(_keys):
+            self._offsets[i] = _pos
+            _pos += len(k) + 1
+        self._offsets[len(_keys)] = _pos
+        return None
+
+    def __len__(self) -> int:
+        return len(self.options)
+
+    def prefix(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """Indices of options starting with `query` (in sorted order)"""
+        from bisect import bisect_left
+        query = query.casefold()
+        _ret: List[int] = []
+        j = bisect_left(self._sortedkeys, query)
+        while j < len(self._sortedkeys) and self._sortedkeys[j].startswith(query):
+            if limit is not None and len(_ret) >= limit:
+                break
+            _ret.append(self._order[j])
+            j += 1
+        return _ret
+
+    def substring(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """Indices of options containing `query` (in original order)"""
+        from bisect import bisect_right
+        query = query.casefold()
+        if "\n" in query:
+            return []
+        _ret: List[int] = []
+        _pos = self._text.find(query)
+        while _pos >= 0:
+            if limit is not None and len(_ret) >= limit:
+                break
+            i = bisect_right(self._offsets, _pos) - 1
+            _ret.append(i)
+            _pos = self._text.find(query, self._offsets[i + 1])
+        return _ret
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """Prefix matches first, then other substring matches"""
+        if len(query) == 0:
+            return list(range(len(self.options) if limit is None else min(limit, len(self.options))))
+        _ret = self.prefix(query, limit)
+        if limit is None or len(_ret) < limit:
+            _found = set(_ret)
+            # NOTE: at most len(_ret) of them are prefix matches (duplicates)
+            for i in self.substring(query, limit):
+                if i not in _found:
+                    _ret.append(i)
+                    if limit is not None and len(_ret) >= limit:
+                        break
+        return _ret
+
+
+class ChoiceBox(ttk.Frame):
+    def __init__(
+        self,
+        master: Misc,
+        options: Union[Iterable[str], Dict[str, Any]],
+        variable: Variable,
+        command: Optional[Callable] = None,
+        limit: int = CHOICE_LIMIT,
+        width: int = 40,
+        height: int = 10,
+        **kwargs,  # ttk.Frame
+    ) -> None:
+        """Searchable single choice (RadioButtons for many options)
+
+        Typing in the search field filters the list (see ChoiceIndex);
+        only the first `limit` matches are shown.
+        Selecting an item sets `variable` to its value.
+
+        Args:
+            options: texts, or {text: value}
+        """
+        _ret = super().__init__(master, **kwargs)
+        if isinstance(options, dict):
+            self.values: List[Any] = list(options.values())
+            options = options.keys()
+        else:
+            options = list(options)
+            self.values = options
+        self.index = ChoiceIndex(options)
+        self.variable = variable
+        self.limit: int = limit
+        self._command = command
+        self._valueindex: Dict[str, int] = {str(v): i for i, v in enumerate(self.values)}
+        self._shown: List[int] = []
+
+        self.search = StringVar(self)
+        self.entry = ttk.Entry(self, textvariable=self.search, width=width)
+        self.listbox = Listbox(self, width=width, height=height, exportselection=False, activestyle="none")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.listbox.yview)
+        self.listbox.configure(yscrollcommand=self.scrollbar.set)
+        self.entry.grid(row=0, column=0, columnspan=2, sticky="ew")
+        self.listbox.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        self._traces = (
+            (self.search, self.search.trace_add("write", self._filter)),
+            (variable, variable.trace_add("write", self._highlight)),
+        )
+        self.listbox.bind("<<ListboxSelect>>", self._select)
+        self.entry.bind("<Return>", self._select_first)
+        self.entry.bind("<Down>", self._focus_list)
+        self._filter()
+        return _ret
+
+    def _filter(self, *args) -> None:
+        self._shown = self.index.search(self.search.get(), self.limit)
+        _options = self.index.options
+        self.listbox.delete(0, END)
+        if len(self._shown) > 0:
+            self.listbox.insert(END, *[_options[i] for i in self._shown])
+        self._highlight()
+        return None
+
+    def _highlight(self, *args) -> None:
+        """Select the row of the current value (if shown)"""
+        self.listbox.selection_clear(0, END)
+        i = self._valueindex.get(str(self.variable.get()))
+        if i is None:
+            return None
+        try:
+            j = self._shown.index(i)
+        except ValueError:
+            return None
+        self.listbox.selection_set(j)
+        self.listbox.see(j)
+        return None
+
+    def _select(self, event=None) -> None:
+        _selection = self.listbox.curselection()
+        if len(_selection) == 0:
+            return None
+        self.set(self.values[self._shown[_selection[0]]])
+        return None
+
+    def _select_first(self, event=None) -> None:
+        if len(self._shown) > 0:
+            self.set(self.values[self._shown[0]])
+        return None
+
+    def _focus_list(self, event=None) -> None:
+        if len(self._shown) > 0:
+            self.listbox.focus_set()
+            self.listbox.activate(0)
+        return None
+
+    def set(self, value: Any) -> None:
+        self.variable.set(value)
+        if self._command is not None:
+            self._command()
+        return None
+
+    def destroy(self) -> None:
+        for _var, _cbname in self._traces:
+            try:
+                _var.trace_remove("write", _cbname)
+            except TclError:
+                pass
+        self._traces = ()
+        return super().destroy()
+
+
+class BaseChoices(BaseGridObject):
+    kind: str = "choice"
+
+    def add(
+        self,
+        options: Union[Iterable[str], Dict[str, Any]],
+        variable: Variable,
+        gridkw: GridKw,
+        name: Optional[str] = None,
+        columnspan: Optional[int] = None,
+        fullspan: bool = False,
+        **kwargs,
+    ) -> None:
+        """
+        Args:
+            **kwargs: ChoiceBox(**kwargs)
+        """
+        kwargs = self._update_kwargs(kwargs, gridkw=gridkw, columnspan=columnspan)
+        if "command" in kwargs:
+            kwargs["command"] = _wrap_command(self.frame, kwargs["command"], name=f"Choice[{name}]")
+        _obj = ChoiceBox(self.frame, options, variable, **kwargs)
+        if name is None:
+            name = "choice"
+        return super().add(_obj, gridkw=gridkw, name=name, columnspan=columnspan, fullspan=fullspan)
+
+
+class Choices(BaseChoices):
+    def __init__(self, frame: ttk.Frame, gridkw: GridKw) -> None:
+        self._gridkw = gridkw
+        return super().__init__(frame)
+    def add(
+        self,
+        options: Union[Iterable[str], Dict[str, Any]],
+        variable: Variable,
+        name: Optional[str] = None,
+        columnspan: Optional[int] = None,
+        fullspan: bool = False,
+        **kwargs,
+    ) -> None:
+        return super().add(options, variable, self._gridkw, name, columnspan, fullspan, **kwargs)
+
+
+class RunningProcess(object):
+    def __init__(
+        self,
+        args: Union[str, List[str]],
+        output: Union[Console, Variable, Callable[[str, str], None], None] = None,
+        on_exit: Optional[Callable[[Optional[int]], None]] = None,
+        encoding: Optional[str] = None,
+        popenkw: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Subprocess started by ProcessRunner
+
+        Attributes:
+            state: 'pending', 'running', 'done', 'cancelled'
+            returncode: None until exit (or if cancelled before start)
+        """
+        self.args = args
+        self.output = output
+        self.on_exit = on_exit
+        self.encoding = encoding
+        self.popenkw: Dict[str, Any] = dict() if popenkw is None else popenkw
+        self.state: str = "pending"
+        self.returncode: Optional[int] = None
+        self.popen = None
+        self._runner: Optional["ProcessRunner"] = None
+        return None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return None if self.popen is None else self.popen.pid
+
+    def cancel(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel(self)
+        return None
+
+    def __repr__(self) -> str:
+        return f"{__class__.__name__}({self.args!r}, state={self.state!r}, returncode={self.returncode!r})"
+
+
+class ProcessRunner(object):
+    def __init__(
+        self,
+        master: Misc,
+        maxprocs: int = 4,
+        interval: int = CONSOLE_INTERVAL,
+        killtimeout: int = 3000,
+    ) -> None:
+        """Run subprocesses without blocking the mainloop
+
+        stdout/stderr are read by worker threads and forwarded in batches
+        (every `interval` ms) on the Tk thread. At most `maxprocs` processes run
+        at once; others wait in order.
+
+        Args:
+            killtimeout: ms between terminate() and kill() on cancel
+        """
+        self._masterref = weakref.ref(master)
+        self.maxprocs: int = maxprocs
+        self.interval: int = interval
+        self.killtimeout: int = killtimeout
+        self.running: List[RunningProcess] = []
+        self.pending: List[RunningProcess] = []
+        self._queue = None
+        self._afterid: Optional[str] = None
+        return None
+
+    @property
+    def master(self) -> Optional[Misc]:
+        return self._masterref()
+
+    def run(
+        self,
+        args: Union[str, List[str]],
+        output: Union[Console, Variable, Callable[[str, str], None], None] = None,
+        on_exit: Optional[Callable[[Optional[int]], None]] = None,
+        encoding: Optional[str] = None,
+        **kwargs,
+    ) -> RunningProcess:
+        """Start (or queue) a subprocess (call from the Tk thread)
+
+        Args:
+            output: Console (write), Variable (set the last line) or func(text, stream)
+            on_exit: on_exit(returncode) (None if cancelled before start)
+            encoding: If None, locale.getpreferredencoding(False)
+            **kwargs: subprocess.Popen(**kwargs)
+        """
+        proc = RunningProcess(args, output=output, on_exit=on_exit, encoding=encoding, popenkw=kwargs)
+        proc._runner = self
+        self.pending.append(proc)
+        self._start_pending()
+        return proc
+
+    def cancel(self, proc: RunningProcess) -> None:
+        if proc.state == "pending":
+            self.pending.remove(proc)
+            proc.state = "cancelled"
+            if proc.on_exit is not None:
+                proc.on_exit(None)
+        elif proc.state == "running":
+            proc.state = "cancelled"
+            proc.popen.terminate()
+            def _kill() -> None:
+                if proc.popen.poll() is None:
+                    proc.popen.kill()
+                return None
+            if self.master is None:
+                _kill()
+            else:
+                self.master.after(self.killtimeout, _kill)
+        return None
+
+    def cancel_all(self) -> None:
+        for proc in self.pending + self.running:
+            self.cancel(proc)
+        return None
+
+    def _shutdown(self) -> None:
+        """Kill all processes and stop polling (the master is being destroyed)"""
+        for proc in self.pending + self.running:
+            if proc.state == "running":
+                proc.popen.kill()
+            proc.state = "cancelled"
+        self.pending.clear()
+        self.running.clear()
+        if self._afterid is not None and self.master is not None:
+            self.master.after_cancel(self._afterid)
+        self._afterid = None
+        return None
+
+    def _start_pending(self) -> None:
+        import subprocess
+        from queue import SimpleQueue
+        from threading import Thread
+        if self._queue is None:
+            self._queue = SimpleQueue()
+        while len(self.pending) > 0 and len(self.running) < self.maxprocs:
+            proc = self.pending.pop(0)
+            _kwargs = dict(stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            _kwargs.update(proc.popenkw)
+            try:
+                proc.popen = subprocess.Popen(proc.args, **_kwargs)
+            except OSError as e:
+                proc.state = "done"
+                self._forward(proc, f"{e}\n", "stderr")
+                if proc.on_exit is not None:
+                    proc.on_exit(None)
+                continue
+            proc.state = "running"
+            self.running.append(proc)
+            Thread(target=self._wait, args=(proc, self._queue), daemon=True).start()
+        if len(self.running) > 0 and self._afterid is None:
+            self._afterid = self.master.after(self.interval, self._poll)
+        return None
+
+    @staticmethod
+    def _read(proc: RunningProcess, stream: str, queue) -> None:
+        """(worker thread) Read a pipe until EOF"""
+        import codecs
+        import locale
+        import os
+        _pipe = getattr(proc.popen, stream)
+        if _pipe is None:
+            return None
+        _encoding = proc.encoding
+        if _encoding is None:
+            _encoding = locale.getpreferredencoding(False)
+        _decoder = codecs.getincrementaldecoder(_encoding)(errors="replace")
+        _fd = _pipe.fileno()
+        while True:
+            _data = os.read(_fd, 65536)
+            _text = _decoder.decode(_data, final=len(_data) == 0)
+            if len(_text) > 0:
+                queue.put((proc, stream, _text))
+            if len(_data) == 0:
+                break
+        _pipe.close()
+        return None
+
+    @classmethod
+    def _wait(cls, proc: RunningProcess, queue) -> None:
+        """(worker thread) Read stdout/stderr and wait for exit"""
+        from threading import Thread
+        _stderr = Thread(target=cls._read, args=(proc, "stderr", queue), daemon=True)
+        _stderr.start()
+        cls._read(proc, "stdout", queue)
+        _stderr.join()
+        queue.put((proc, None, proc.popen.wait()))
+        return None
+
+    def _forward(self, proc: RunningProcess, text: str, stream: str) -> None:
+        _output = proc.output
+        if _output is None:
+            pass
+        elif isinstance(_output, Variable):
+            _lines = [x for x in text.splitlines() if len(x.strip()) > 0]
+            if len(_lines) > 0:
+                _output.set(_lines[-1])
+        elif hasattr(_output, "write"):
+            _output.write(text)
+        else:
+            _output(text, stream)
+        return None
+
+    def _poll(self) -> None:
+        """(Tk thread) Forward queued output in batches"""
+        self._afterid = None
+        _chunks: List[list] = []
+        _exited: List[Tuple[RunningProcess, int]] = []
+        while not self._queue.empty():
+            proc, stream, data = self._queue.get()
+            if stream is None:
+                _exited.append((proc, data))
+            elif len(_chunks) > 0 and _chunks[-1][0] is proc and _chunks[-1][1] == stream:
+                _chunks[-1][2].append(data)
+            else:
+                _chunks.append([proc, stream, [data]])
+        for proc, stream, data in _chunks:
+            self._forward(proc, "".join(data), stream)
+        for proc, returncode in _exited:
+            proc.returncode = returncode
+            if proc.state == "running":
+                proc.state = "done"
+            self.running.remove(proc)
+            if proc.on_exit is not None:
+                proc.on_exit(returncode)
+        self._start_pending()
+        return None
+
+
+class ConfigBinding(object):
+    def __init__(
+        self,
+        config: "Config",
+        target: Union[_DictLikeObjects, ModelVars],
+        section: Optional[str] = None,
+        keys: Optional[list] = None,
+        push: bool = True,
+        validate: bool = False,
+    ) -> None:
+        """Two-way binding between a Config section and Entries/StringVars
+
+        Only changed keys are transferred in each direction:
+        `push()` compares with the last synced values and `pull()` reads only dirty keys.
+
+        Example:
+            >>> binding = ConfigBinding(config, window.entries)
+            >>> binding.pull()  # on save
+            ["n"]
+
+        Args:
+            section: If None, `config.section`
+            keys: If None, keys of the section which exist in `target`
+            push: If True, push all values now
+            validate: If True, set validators of Entries from the default types
+        """
+        self.config = config
+        self.target = target
+        if section is None:
+            section = config.section
+        self.section: str = section
+        if keys is None:
+            keys = [k for k in config.data[section].keys() if k in target]
+        self.keys: list = keys
+        self._synced: Dict[Any, str] = dict()
+        if push:
+            self.push()
+        if validate:
+            _default = config.default.get(section, dict())
+            for k in keys:
+                if k not in _default:
+                    continue
+                _validator = Validator.from_default(_default[k])
+                # NOTE: str defaults accept any value (no validator)
+                if _validator is not None:
+                    target.set_validator(k, _validator)
+        return None
+
+    def push(self) -> list:
+        """Config -> target
+
+        Returns:
+            list: changed keys
+        """
+        _data = self.config.data[self.section]
+        _changes = dict()
+        for k in self.keys:
+            _v = str(_data[k])
+            if self._synced.get(k) != _v:
+                _changes[k] = _v
+        if len(_changes) > 0:
+            self.target.set_many(_changes)
+            self.target.clear_dirty(list(_changes.keys()))
+            self._synced.update(_changes)
+        return list(_changes.keys())
+
+    def pull(self) -> list:
+        """Target -> config (cast to type of default value)
+
+        Returns:
+            list: changed keys
+        """
+        _keys = set(self.keys)
+        _dirty = [k for k in self.target.dirty_keys() if k in _keys]
+        if len(_dirty) == 0:
+            return []
+        _default = self.config.default.get(self.section, dict())
+        _changed = []
+        for k, v in self.target.get_all(_dirty).items():
+            if v == self._synced.get(k):
+                continue
+            if k in _default:
+                self.config.data[self.section][k] = self.config._cast_value(v, _default[k])
+            else:
+                self.config.data[self.section][k] = v
+            self._synced[k] = v
+            _changed.append(k)
+        self.target.clear_dirty(_dirty)
+        return _changed
+
+    def discard(self) -> list:
+        """Revert edits of the target which are not pulled
+
+        Returns:
+            list: reverted keys
+        """
+        _keys = set(self.keys)
+        _dirty = [k for k in self.target.dirty_keys() if k in _keys and k in self._synced]
+        if len(_dirty) > 0:
+            self.target.set_many({k: self._synced[k] for k in _dirty})
+            self.target.clear_dirty(_dirty)
+        return _dirty
+
+
+def _new_gridobjects(master: Misc, datatype: type):
+    """Create a grid object collection for window/region `master`"""
+    if datatype is Labels:
+        _obj = Labels(master.frame, master.gridkw, master.labelkw, master.fonts)
+    elif datatype is Entries:
+        _obj = Entries(master.frame, master.gridkw, defaultvalue="")
+    else:
+        _obj = datatype(master.frame, master.gridkw)
+    _obj.defaultwidth = master._defaultwidth
+    _obj.registry = master.widgets
+    return _obj
+
+
+class _LazyGridObjects(object):
+    def __init__(self, datatype: type) -> None:
+        """Create the collection on first access and cache it in the instance"""
+        self._datatype = datatype
+        self._name: str = ""
+        return None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+        return None
+
+    def __get__(self, instance, owner: Optional[type] = None):
+        if instance is None:
+            return self
+        _obj = _new_gridobjects(instance, self._datatype)
+        instance.__dict__[self._name] = _obj
+        return _obj
+
+
+def _init_gridobjects(
+    master: Misc,
+    label: bool,
+    button: bool,
+    radiobutton: bool,
+    entry: bool,
+) -> None:
+    """Disable collections (others are created lazily)"""
+    for _name, _enabled in (
+        ("labels", label),
+        ("buttons", button),
+        ("radiobuttons", radiobutton),
+        ("entries", entry),
+    ):
+        if not _enabled:
+            master.__dict__[_name] = None
+    return None
+
+
+def _bind_firstmap(widget: Misc, callback: Callable[[], None]) -> None:
+    """Call `callback()` once, when `widget` is shown for the first time
+
+    NOTE: bound to a dedicated bindtag of `widget` only. A binding on a toplevel
+          would also run for the <Map> of every child widget.
+    """
+    _tag = f"stgfirstmap{id(widget)}"
+    def _onmap(event) -> None:
+        widget.bindtags(tuple(x for x in widget.bindtags() if x != _tag))
+        widget.unbind_class(_tag, "<Map>")
+        widget._root().deletecommand(_funcid)  # registered on the root by bind_class()
+        callback()
+        return None
+    _funcid = widget.bind_class(_tag, "<Map>", _onmap)
+    widget.bindtags((_tag,) + widget.bindtags())
+    return None
 
 
-class Buttons(BaseButtons):
-    def __init__(self, frame: ttk.Frame, gridkw: GridKw) -> None:
-        self._gridkw = gridkw
-        return super().__init__(frame)
-    def add(
+class GridRegion(ttk.Frame):
+    labels = _LazyGridObjects(Labels)
+    buttons = _LazyGridObjects(Buttons)
+    radiobuttons = _LazyGridObjects(RadioButtons)
+    entries = _LazyGridObjects(Entries)
+    consoles = _LazyGridObjects(Consoles)
+    charts = _LazyGridObjects(Charts)
+    choices = _LazyGridObjects(Choices)
+    progressbars = _LazyGridObjects(ProgressBars)
+
+    def __init__(
         self,
-        text: str,
-        command,
-        name: Optional[str] = None,
-        columnspan: Optional[int] = None,
-        fullspan: bool = False,
-        **kwargs,
+        master: Misc,
+        builder: Optional[Callable[["GridRegion"], None]] = None,
+        maxcolumn: Optional[int] = None,
+        sticky: str = W,
+        labelkw: Optional[LabelKw] = None,
+        fonts: Optional[FontRegistry] = None,
+        defaultwidth: Optional[int] = None,
+        padding: int = 0,
+        **kwargs,  # ttk.Frame
     ) -> None:
-        return super().add(text, command, self._gridkw, name, columnspan, fullspan, **kwargs)
+        """Grid region whose widgets are built when it is first shown
 
+        Args:
+            builder: builder(region) adds widgets to the region
+        """
+        _ret = super().__init__(master, padding=padding, **kwargs)
+        self.frame = self
+        self.gridkw = GridKw(maxcolumn=maxcolumn, sticky=sticky)
+        self.widgets = WidgetRegistry()
+        if labelkw is None:
+            labelkw = LabelKw()
+        self.labelkw = labelkw
+        self.fonts = fonts
+        self._defaultwidth = defaultwidth
+        self._builder = builder
+        self.built: bool = False
+        _bind_firstmap(self, self.build)
+        return _ret
 
-class RadioButtons(BaseRadioButtons):
-    def __init__(self, frame: ttk.Frame, gridkw: GridKw) -> None:
-        self._gridkw = gridkw
-        return super().__init__(frame)
-    def add(
+    def build(self) -> None:
+        """Build widgets (if not built yet)"""
+        if self.built:
+            return None
+        self.built = True
+        if self._builder is not None:
+            self._builder(self)
+        return None
+
+    def show(self) -> None:
+        self.grid()
+        return None
+
+    def hide(self) -> None:
+        self.grid_remove()
+        return None
+
+    def toggle(self) -> None:
+        if self.winfo_ismapped():
+            self.hide()
+        else:
+            self.show()
+        return None
+
+    def lf(self, n: int = 1) -> None:
+        """Line Feed"""
+        self.gridkw.lf(1)
+        for _ in range(n - 1):
+            self.labels.add("", fullspan=True)
+        return None
+
+    def add_region(
         self,
-        text: str,
-        value: Any,
-        variable: Variable,
-        name: str = None,
+        builder: Optional[Callable[["GridRegion"], None]] = None,
+        hidden: bool = False,
         columnspan: Optional[int] = None,
-        fullspan: bool = False,
+        fullspan: bool = True,
         **kwargs,
-    ) -> None:
-        return super().add(text, value, variable, self._gridkw, name, columnspan, fullspan, **kwargs)
+    ) -> "GridRegion":
+        return _add_region(self, builder, hidden, columnspan, fullspan, **kwargs)
+
+
+def _add_region(
+    master: Misc,
+    builder: Optional[Callable[[GridRegion], None]],
+    hidden: bool,
+    columnspan: Optional[int],
+    fullspan: bool,
+    **kwargs,
+) -> GridRegion:
+    kwargs.setdefault("maxcolumn", master.gridkw.maxcolumn)
+    kwargs.setdefault("sticky", master.gridkw.sticky)
+    kwargs.setdefault("defaultwidth", master._defaultwidth)
+    region = GridRegion(
+        master.frame,
+        builder,
+        labelkw=master.labelkw,
+        fonts=master.fonts,
+        **kwargs,
+    )
+    _gridargs = master.gridkw.pull(columnspan=columnspan, fullspan=fullspan)
+    # registered so that row operations (insert_rows, ...) move the region too
+    master.widgets.add(GridItem(
+        "region", str(region), region,
+        _gridargs["row"], _gridargs["column"], _gridargs["columnspan"],
+    ))
+    region.grid(**_gridargs)
+    if hidden:
+        region.grid_remove()
+    return region
+
+
+class LifecycleTracker(object):
+    def __init__(self) -> None:
+        """Debug tracking of live windows, widgets and variables
+
+        Example:
+            >>> lifecycle.enable(tracemalloc_frames=10)
+            >>> lifecycle.report(root)
+        """
+        self.enabled: bool = False
+        self.frames: int = 0
+        self._sites: Dict[int, str] = dict()
+        # NOTE: id -> object (tkinter.Variable is not hashable)
+        self._objects: Dict[str, weakref.WeakValueDictionary] = {
+            "windows": weakref.WeakValueDictionary(),
+            "widgets": weakref.WeakValueDictionary(),
+            "variables": weakref.WeakValueDictionary(),
+        }
+        return None
 
+    def enable(self, tracemalloc_frames: int = 0) -> None:
+        """
+        Args:
+            tracemalloc_frames: If > 0, start tracemalloc for allocation sites
+        """
+        if tracemalloc_frames > 0:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(tracemalloc_frames)
+        self.frames = tracemalloc_frames
+        self.enabled = True
+        return None
 
-class Entries(BaseEntries):
-    def __init__(
-        self,
-        frame: ttk.Frame,
-        gridkw: GridKw,
-        keys: Union[list, tuple, set, None] = None,
-        defaultvalue: Optional[str] = None,
-        **kwargs,
-    ) -> None:
-        self._data: Dict[Any, SettableEntry]
-        self._frame = frame
-        self._gridkw = gridkw
-        self.defaultwidth: int = 80
-        return super().__init__(keys, defaultvalue, **kwargs)
-    def add(
-        self,
-        key: Any,  # set
-        value: str,  # set
-        defaultvalue: Optional[str] = None,  # BaseEntries
-        width: Optional[int] = None,  # BaseEntries
-        **kwargs,  # Entry
-    ) -> None:
-        if width is None:
-            width = self.defaultwidth
-        _ret =  super().add(key, defaultvalue, width=width, master=self._frame, **kwargs)
-        self.set(key, value)
-        self._data[key].grid(**self._gridkw.pull(fullspan=True))
+    def disable(self) -> None:
+        self.enabled = False
+        for d in self._objects.values():
+            d.clear()
+        self._sites.clear()
+        return None
+
+    def track(self, obj: Any, kind: str) -> None:
+        """
+        Args:
+            kind: 'windows', 'widgets', 'variables'
+        """
+        if self.enabled:
+            self._objects[kind][id(obj)] = obj
+            if self.frames > 0:
+                self._sites[id(obj)] = self._caller()
+        return None
+
+    @staticmethod
+    def _isexternal(filename: str) -> bool:
+        return "tkinter" not in filename and "simpletkgrid" not in filename
+
+    @classmethod
+    def _caller(cls) -> str:
+        import sys
+        frame = sys._getframe(1)
+        while frame.f_back is not None and not cls._isexternal(frame.f_code.co_filename):
+            frame = frame.f_back
+        return f"{frame.f_code.co_filename}:{frame.f_lineno}"
+
+    def _site(self, obj: Any) -> Optional[str]:
+        """Allocation site outside tkinter/simpletkgrid"""
+        import tracemalloc
+        _tb = tracemalloc.get_object_traceback(obj)
+        if _tb is None:
+            # NOTE: not available for some objects (e.g. with managed dict);
+            #       fall back to the caller of track()
+            return self._sites.get(id(obj))
+        for frame in reversed(list(_tb)):
+            if self._isexternal(frame.filename):
+                return f"{frame.filename}:{frame.lineno}"
+        return f"{_tb[-1].filename}:{_tb[-1].lineno}"
+
+    def report(self, root: Optional[Misc] = None) -> Dict[str, Any]:
+        """Live objects by class (and by allocation site if tracemalloc is tracing)
+
+        Args:
+            root: If given, count Tcl variables (PY_VAR*) of its interpreter
+        """
+        import gc
+        import tracemalloc
+        gc.collect()
+        _alive = set().union(*(d.keys() for d in self._objects.values()))
+        self._sites = {k: v for k, v in self._sites.items() if k in _alive}
+        _ret: Dict[str, Any] = dict()
+        for kind, d in self._objects.items():
+            _objs = list(d.values())
+            _classes: Dict[str, int] = dict()
+            _sites: Dict[str, int] = dict()
+            for obj in _objs:
+                _name = type(obj).__qualname__
+                _classes[_name] = _classes.get(_name, 0) + 1
+                if tracemalloc.is_tracing():
+                    _site = self._site(obj)
+                    if _site is not None:
+                        _sites[_site] = _sites.get(_site, 0) + 1
+            _ret[kind] = dict(count=len(_objs), classes=_classes, sites=_sites)
+        if root is not None:
+            _ret["tcl_variables"] = len(root.tk.splitlist(root.tk.call("info", "globals", "PY_VAR*")))
+        if tracemalloc.is_tracing():
+            _ret["traced_bytes"] = tracemalloc.get_traced_memory()[0]
         return _ret
 
 
-def _init_gridobjects(
-    frame: ttk.Frame,
-    gridkw: GridKw,
-    labelkw: LabelKw,
-    defaultwidth: Optional[int],
-    label: bool,
-    button: bool,
-    radiobutton: bool,
-    entry: bool,
-) -> tuple:
-    """
-    Returns:
-        (labels, buttons, radiobuttons, entries)
-    """
-    if label:
-        labels = Labels(frame, gridkw, labelkw)
-        labels.defaultwidth = defaultwidth
-    else:
-        labels = None
-    if button:
-        buttons = Buttons(frame, gridkw)
-        buttons.defaultwidth = defaultwidth
-    else:
-        buttons = None
-    if radiobutton:
-        radiobuttons = RadioButtons(frame, gridkw)
-        radiobuttons.defaultwidth = defaultwidth
-    else:
-        radiobuttons = None
-    if entry:
-        entries = Entries(frame, gridkw, defaultvalue="")
-        entries.defaultwidth = defaultwidth
-    else:
-        entries = None
-    return (labels, buttons, radiobuttons, entries)
+lifecycle = LifecycleTracker()
+
+
+def _cleanup_window(window: Misc) -> None:
+    """Release Python-side references of a window being destroyed"""
+    window.processes._shutdown()
+    for _name in ("labels", "buttons", "radiobuttons", "entries", "consoles", "charts", "choices", "progressbars"):
+        _obj = window.__dict__.get(_name)
+        if _obj is not None:
+            _obj._clear()
+    window.stringvars._clear()
+    window.modelvars._clear()
+    window.widgets.clear()
+    window.fonts.release()
+    return None
 
 
 class RootWindow(Tk):
+    labels = _LazyGridObjects(Labels)
+    buttons = _LazyGridObjects(Buttons)
+    radiobuttons = _LazyGridObjects(RadioButtons)
+    entries = _LazyGridObjects(Entries)
+    consoles = _LazyGridObjects(Consoles)
+    charts = _LazyGridObjects(Charts)
+    choices = _LazyGridObjects(Choices)
+    progressbars = _LazyGridObjects(ProgressBars)
+
     def __init__(
         self,
         title: str = "",
@@ -454,6 +3220,8 @@ class RootWindow(Tk):
     ) -> None:
         _ret = super().__init__(**kwargs)
 
+        # NOTE: the default handler destroys the window in Tcl, bypassing destroy()/cleanup
+        self.protocol("WM_DELETE_WINDOW", self.close)
         self.title(title)
         if type(resizable) is bool:
             resizable = (resizable, resizable)
@@ -461,25 +3229,62 @@ class RootWindow(Tk):
         self.frame = ttk.Frame(self, padding=padding)
         self.frame.grid()
         self.gridkw = GridKw(maxcolumn=maxcolumn, sticky=sticky)
+        self.widgets = WidgetRegistry()
         self.labelkw = LabelKw(fontsize=fontsize)
+        self.fonts = FontRegistry(self, fontsize=fontsize)
         self.stringvars = StringVars([], defaultvalue="")
+        self.modelvars = ModelVars(self, defaultvalue="")
+        self.processes = ProcessRunner(self)
 
+        # created on first access
         self.labels: Labels
         self.buttons: Buttons
         self.radiobuttons: RadioButtons
         self.entries: Entries
-        self.labels, self.buttons, self.radiobuttons, self.entries = _init_gridobjects(
-            frame=self.frame,
-            gridkw=self.gridkw,
-            labelkw=self.labelkw,
-            defaultwidth=defaultwidth,
-            label=label,
-            button=button,
-            radiobutton=radiobutton,
-            entry=entry,
-        )
+        self._defaultwidth = defaultwidth
+        _init_gridobjects(self, label=label, button=button, radiobutton=radiobutton, entry=entry)
+        lifecycle.track(self, "windows")
+        _bind_firstmap(self, self.build)
         return _ret
 
+    def build(self) -> None:
+        """Called when the window is shown for the first time (override to defer building widgets)"""
+        return None
+
+    def insert_rows(self, row: int, n: int = 1) -> None:
+        """Insert n empty rows before `row` (see `gridkw.at()` to fill them)"""
+        return self.widgets.insert_rows(row, n, gridkw=self.gridkw)
+
+    def remove_rows(self, row: int, n: int = 1) -> None:
+        """Destroy widgets in n rows from `row` and close up the rows below"""
+        self.widgets.remove_rows(row, n, gridkw=self.gridkw)
+        return None
+
+    def move_row(self, src: int, dst: int) -> None:
+        return self.widgets.move_row(src, dst)
+
+    def add_region(
+        self,
+        builder: Optional[Callable[[GridRegion], None]] = None,
+        hidden: bool = False,
+        columnspan: Optional[int] = None,
+        fullspan: bool = True,
+        **kwargs,
+    ) -> GridRegion:
+        """Add a grid region whose widgets are built by `builder(region)` when first shown
+
+        Args:
+            hidden: If True, the region is hidden until `region.show()`
+            **kwargs: GridRegion(**kwargs)
+        """
+        return _add_region(self, builder, hidden, columnspan, fullspan, **kwargs)
+
+    def set_fontsize(self, fontsize: int) -> None:
+        """Change font size of labels"""
+        self.labelkw["font"] = (self.labelkw["font"][0], fontsize)
+        self.fonts.set_fontsize(fontsize)
+        return None
+
     def lf(self, n: int = 1) -> None:
         """Line Feed"""
         self.gridkw.lf(1)
@@ -487,6 +3292,76 @@ class RootWindow(Tk):
             self.labels.add("", fullspan=True)
         return None
 
+    def bind(self, sequence=None, func=None, add=None):
+        """Tk.bind() (coroutine functions are accepted)"""
+        return super().bind(sequence, _wrap_command(self, func, name=f"bind[{sequence}]"), add)
+
+    def instrument(self, watchdog: Optional[int] = None, stream: Any = None) -> CallbackStats:
+        """Time callbacks registered from now on (Buttons, RadioButtons, bind)
+
+        Args:
+            watchdog: If given, dump the Tk thread's stack when the mainloop stalls for this ms
+            stream: file-like for the dump (default: sys.stderr)
+
+        Returns:
+            CallbackStats (see `to_dict()`, `save()`)
+        """
+        _stats = getattr(self, "_callbackstats", None)
+        if _stats is None:
+            _stats = self._callbackstats = CallbackStats(self)
+        if watchdog is not None:
+            _stats.stop_watchdog()
+            _stats.start_watchdog(watchdog, stream=stream)
+        return _stats
+
+    async def async_mainloop(self, interval: int = ASYNC_INTERVAL) -> None:
+        """Run the Tk event loop cooperatively in the running asyncio loop
+
+        Example:
+            >>> asyncio.run(root.async_mainloop())
+
+        To keep coroutine commands started before (on the private loop), use `run_async()`.
+
+        Args:
+            interval: Maximum latency(ms) of UI events
+        """
+        import asyncio
+        bridge = _get_asyncbridge(self)
+        bridge.attach(asyncio.get_running_loop())
+        try:
+            while True:
+                try:
+                    self.update()
+                except TclError:
+                    # destroyed
+                    break
+                await asyncio.sleep(interval / 1000)
+        finally:
+            bridge.detach()
+        return None
+
+    def run_async(self, interval: int = ASYNC_INTERVAL) -> None:
+        """Run `async_mainloop()` on the event loop of coroutine commands (blocking)
+
+        Unlike `asyncio.run(root.async_mainloop())`, tasks started before continue.
+        """
+        bridge = _get_asyncbridge(self)
+        try:
+            bridge.private().run_until_complete(self.async_mainloop(interval))
+        finally:
+            bridge.close()
+        return None
+
+    def destroy(self) -> None:
+        _stats = getattr(self, "_callbackstats", None)
+        if _stats is not None:
+            _stats.stop_watchdog()
+        _bridge = getattr(self, "_asyncbridge", None)
+        if _bridge is not None:
+            _bridge.close()
+        _cleanup_window(self)
+        return super().destroy()
+
     def close(self, event=None) -> None:
         """Close root window"""
         self.destroy()
@@ -494,6 +3369,18 @@ class RootWindow(Tk):
 
 
 class SubWindow(Toplevel):
+    # If True, close() withdraws the window and open() reuses it
+    pooled: bool = False
+    _pool: Dict[type, "SubWindow"] = dict()
+    labels = _LazyGridObjects(Labels)
+    buttons = _LazyGridObjects(Buttons)
+    radiobuttons = _LazyGridObjects(RadioButtons)
+    entries = _LazyGridObjects(Entries)
+    consoles = _LazyGridObjects(Consoles)
+    charts = _LazyGridObjects(Charts)
+    choices = _LazyGridObjects(Choices)
+    progressbars = _LazyGridObjects(ProgressBars)
+
     def __init__(
         self,
         title: str = "",
@@ -507,10 +3394,15 @@ class SubWindow(Toplevel):
         button: bool = True,
         radiobutton: bool = True,
         entry: bool = True,
+        pooled: Optional[bool] = None,
         **kwargs,
     ) -> None:
         _ret = super().__init__(**kwargs)
 
+        if pooled is not None:
+            self.pooled = pooled
+        # NOTE: the default handler destroys the window in Tcl, bypassing destroy()/cleanup
+        self.protocol("WM_DELETE_WINDOW", self.close)
         self.title(title)
         if type(resizable) is bool:
             resizable = (resizable, resizable)
@@ -520,25 +3412,62 @@ class SubWindow(Toplevel):
         self.frame = ttk.Frame(self, padding=padding)
         self.frame.grid()
         self.gridkw = GridKw(maxcolumn=maxcolumn, sticky=sticky)
+        self.widgets = WidgetRegistry()
         self.labelkw = LabelKw(fontsize=fontsize)
+        self.fonts = FontRegistry(self, fontsize=fontsize)
         self.stringvars = StringVars([], defaultvalue="")
+        self.modelvars = ModelVars(self, defaultvalue="")
+        self.processes = ProcessRunner(self)
 
+        # created on first access
         self.labels: Labels
         self.buttons: Buttons
         self.radiobuttons: RadioButtons
         self.entries: Entries
-        self.labels, self.buttons, self.radiobuttons, self.entries = _init_gridobjects(
-            frame=self.frame,
-            gridkw=self.gridkw,
-            labelkw=self.labelkw,
-            defaultwidth=defaultwidth,
-            label=label,
-            button=button,
-            radiobutton=radiobutton,
-            entry=entry,
-        )
+        self._defaultwidth = defaultwidth
+        _init_gridobjects(self, label=label, button=button, radiobutton=radiobutton, entry=entry)
+        lifecycle.track(self, "windows")
+        _bind_firstmap(self, self.build)
         return _ret
 
+    def build(self) -> None:
+        """Called when the window is shown for the first time (override to defer building widgets)"""
+        return None
+
+    def insert_rows(self, row: int, n: int = 1) -> None:
+        """Insert n empty rows before `row` (see `gridkw.at()` to fill them)"""
+        return self.widgets.insert_rows(row, n, gridkw=self.gridkw)
+
+    def remove_rows(self, row: int, n: int = 1) -> None:
+        """Destroy widgets in n rows from `row` and close up the rows below"""
+        self.widgets.remove_rows(row, n, gridkw=self.gridkw)
+        return None
+
+    def move_row(self, src: int, dst: int) -> None:
+        return self.widgets.move_row(src, dst)
+
+    def add_region(
+        self,
+        builder: Optional[Callable[[GridRegion], None]] = None,
+        hidden: bool = False,
+        columnspan: Optional[int] = None,
+        fullspan: bool = True,
+        **kwargs,
+    ) -> GridRegion:
+        """Add a grid region whose widgets are built by `builder(region)` when first shown
+
+        Args:
+            hidden: If True, the region is hidden until `region.show()`
+            **kwargs: GridRegion(**kwargs)
+        """
+        return _add_region(self, builder, hidden, columnspan, fullspan, **kwargs)
+
+    def set_fontsize(self, fontsize: int) -> None:
+        """Change font size of labels"""
+        self.labelkw["font"] = (self.labelkw["font"][0], fontsize)
+        self.fonts.set_fontsize(fontsize)
+        return None
+
     def lf(self, n: int = 1) -> None:
         """Line Feed"""
         self.gridkw.lf(1)
@@ -546,36 +3475,401 @@ class SubWindow(Toplevel):
             self.labels.add("", fullspan=True)
         return None
 
+    def bind(self, sequence=None, func=None, add=None):
+        """Toplevel.bind() (coroutine functions are accepted)"""
+        return super().bind(sequence, _wrap_command(self, func, name=f"bind[{sequence}]"), add)
+
+    @classmethod
+    def open(cls, *args, **kwargs) -> "SubWindow":
+        """Open the window
+
+        If `pooled` is True, a closed (withdrawn) window of the same class is reused.
+        Its widgets are kept and only `refresh()` is called.
+
+        Args:
+            *args, **kwargs: cls(*args, **kwargs) (used only for construction)
+        """
+        window = cls._pool.get(cls)
+        if window is not None:
+            try:
+                _exists = bool(window.winfo_exists())
+            except TclError:
+                _exists = False
+            if _exists:
+                window.reopen()
+                return window
+            del cls._pool[cls]
+        window = cls(*args, **kwargs)
+        if window.pooled:
+            cls._pool[cls] = window
+        return window
+
+    def refresh(self) -> None:
+        """Called when a pooled window is reopened (override to update values)"""
+        return None
+
+    def reopen(self) -> None:
+        """Show the withdrawn window again"""
+        self.refresh()
+        self.deiconify()
+        self.lift()
+        self.grab_set()
+        self.focus_set()
+        return None
+
+    def destroy(self) -> None:
+        _cleanup_window(self)
+        if self._pool.get(type(self)) is self:
+            del self._pool[type(self)]
+        return super().destroy()
+
     def close(self, event=None) -> None:
-        """Close the window"""
+        """Close the window (withdraw if pooled)"""
         self.grab_release()
-        self.destroy()
+        if self.pooled:
+            self.withdraw()
+        else:
+            self.destroy()
+        return None
+
+
+def _iterchunks(
+    data: Union[str, bytes, Iterable[Union[str, bytes]], IO],
+    chunksize: int = SAVE_CHUNKSIZE,
+) -> Iterator[Union[str, bytes]]:
+    if isinstance(data, (str, bytes)):
+        for i in range(0, len(data), chunksize):
+            yield data[i:i + chunksize]
+    elif hasattr(data, "read"):
+        while True:
+            _chunk = data.read(chunksize)
+            if len(_chunk) == 0:
+                break
+            yield _chunk
+    else:
+        yield from data
+
+
+def _write_atomic(
+    filepath: Path,
+    data: Union[str, bytes, Iterable[Union[str, bytes]], IO],
+    mode: str = "t",
+    chunksize: int = SAVE_CHUNKSIZE,
+    progress: Optional[Callable[[int], None]] = None,
+) -> None:
+    """Write to a temporary file in the same directory, then rename it to `filepath`
+
+    Args:
+        progress: progress(written) after each chunk (characters or bytes)
+    """
+    import os
+    # NOTE: created with mode 0o666 so that the kernel applies the umask
+    #       (reading it with os.umask() is not thread-safe)
+    while True:
+        _tmppath = str(filepath.parent / f".{filepath.name}.{os.urandom(4).hex()}.tmp")
+        try:
+            _fd = os.open(_tmppath, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        with os.fdopen(_fd, mode="w" + mode) as f:
+            _written = 0
+            for _chunk in _iterchunks(data, chunksize):
+                f.write(_chunk)
+                _written += len(_chunk)
+                if progress is not None:
+                    progress(_written)
+        if filepath.exists():
+            # keep permission of the original file
+            os.chmod(_tmppath, filepath.stat().st_mode)
+        os.replace(_tmppath, filepath)
+    except BaseException:
+        Path(_tmppath).unlink()
+        raise
+    return None
+
+
+_PROBE_CACHE: Dict[str, Tuple[float, Tuple[Optional[str], Optional[str]]]] = dict()
+# running probes (e.g. stuck in stat() on a hung mount)
+_PROBE_INFLIGHT: Dict[str, Any] = dict()
+
+
+def _probe_path(
+    initialpath: Union[str, Path],
+    timeout: float = PROBE_TIMEOUT,
+) -> Tuple[Optional[str], Optional[str]]:
+    """Resolve initialpath into (dirpath, filename) in a worker thread
+
+    Only one probe runs per path. While it is running (after a timeout),
+    later calls return at once without waiting.
+
+    Returns:
+        (None, None) if not found or timed out (the result is cached when the probe finishes)
+    """
+    import time
+    from threading import Thread
+    _key = str(initialpath)
+    _cached = _PROBE_CACHE.get(_key)
+    if _cached is not None and time.monotonic() - _cached[0] < PROBE_TTL:
+        return _cached[1]
+    if _key in _PROBE_INFLIGHT:
+        return (None, None)
+
+    def _probe() -> None:
+        try:
+            _path = Path(initialpath).resolve()
+            if _path.is_dir():
+                _ret = (str(_path), None)
+            elif _path.parent.is_dir():
+                _ret = (str(_path.parent), str(_path.name))
+            else:
+                _ret = (None, None)
+            _PROBE_CACHE[_key] = (time.monotonic(), _ret)
+        finally:
+            _PROBE_INFLIGHT.pop(_key, None)
+        return None
+
+    _thread = Thread(target=_probe, daemon=True)
+    _PROBE_INFLIGHT[_key] = _thread
+    _thread.start()
+    _thread.join(timeout)
+    _cached = _PROBE_CACHE.get(_key)
+    if _thread.is_alive() or _cached is None:
+        return (None, None)
+    return _cached[1]
+
+
+class RecentPaths(object):
+    def __init__(
+        self,
+        config: Optional["Config"] = None,
+        key: str = "recentdirs",
+        section: Optional[str] = None,
+        maxlen: int = 10,
+        autosave: bool = False,
+    ) -> None:
+        """Most recently used directories (newest first), stored in `config[section][key]`
+
+        Args:
+            autosave: If True, save the config file on every `add()`
+        """
+        self.config = config
+        self.key = key
+        self.section: Optional[str] = section
+        self.maxlen: int = maxlen
+        self.autosave: bool = autosave
+        self._paths: List[str] = []
+        if config is not None:
+            if self.section is None:
+                self.section = config.section
+            _v = config.data.get(self.section, dict()).get(key, [])
+            if isinstance(_v, str):
+                _v = config._cast_value(_v, []) if len(_v) > 0 else []
+            self._paths = [str(x) for x in _v][:maxlen]
+        return None
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __getitem__(self, i: int) -> str:
+        return self._paths[i]
+
+    def __iter__(self):
+        return iter(list(self._paths))
+
+    def add(self, path: Union[str, Path]) -> None:
+        path = str(path)
+        if path in self._paths:
+            self._paths.remove(path)
+        self._paths.insert(0, path)
+        del self._paths[self.maxlen:]
+        if self.config is not None:
+            self.config.data.setdefault(self.section, dict())[self.key] = list(self._paths)
+            if self.autosave:
+                self.config.save(section=self.section, mode="add", keep_original_file=False)
+        return None
+
+
+class MappedLines(object):
+    def __init__(
+        self,
+        filepath: Union[str, Path],
+        encoding: str = "utf-8",
+        errors: str = "replace",
+        blocksize: int = 1 << 16,
+    ) -> None:
+        """Lazy read-only line view of a memory-mapped file
+
+        The line index keeps only the number of lines before each block of
+        `blocksize` bytes, so its size is filesize / blocksize.
+        Random access (`lines[i]`) is available for indexed blocks.
+        """
+        import mmap
+        from array import array
+        self.filepath = Path(filepath)
+        self.encoding = encoding
+        self.errors = errors
+        self.blocksize: int = blocksize
+        self._file = self.filepath.open(mode="rb")
+        self.size: int = self.filepath.stat().st_size
+        if self.size > 0:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._mm = None
+        # number of newlines before each block
+        self._blocks = array("Q", [0])
+        self._newlines: int = 0
+        self.indexed: int = 0  # bytes
+        self.complete: bool = self.size == 0
+        self._stop: bool = False
+        return None
+
+    def _decode(self, data: bytes) -> str:
+        return data.decode(self.encoding, errors=self.errors).rstrip("\r\n")
+
+    def head(self, n: int = 20) -> List[str]:
+        """First n lines (without the index)"""
+        _lines = []
+        pos = 0
+        while self._mm is not None and pos < self.size and len(_lines) < n:
+            end = self._mm.find(b"\n", pos)
+            end = self.size if end < 0 else end + 1
+            _lines.append(self._decode(self._mm[pos:end]))
+            pos = end
+        return _lines
+
+    def build_index(self, progress: Optional[Callable[[int], None]] = None) -> None:
+        """Count lines block by block (can be run in a worker thread)
+
+        Args:
+            progress: progress(indexed_bytes) after each block
+        """
+        while not self.complete and not self._stop:
+            start = self.indexed
+            end = min(start + self.blocksize, self.size)
+            self._newlines += self._mm[start:end].count(b"\n")
+            self.indexed = end
+            if end >= self.size:
+                self.complete = True
+            else:
+                self._blocks.append(self._newlines)
+            if progress is not None:
+                progress(end)
+        return None
+
+    def start_indexing(self):
+        """Build the index in a daemon thread
+
+        Returns:
+            threading.Thread
+        """
+        from threading import Thread
+        _thread = Thread(target=self.build_index, daemon=True)
+        _thread.start()
+        return _thread
+
+    def __len__(self) -> int:
+        """Number of lines
+
+        Raises:
+            RuntimeError: If the index is not complete
+        """
+        if not self.complete:
+            raise RuntimeError("Line index is not complete")
+        if self.size == 0:
+            return 0
+        return self._newlines + (0 if self._mm[self.size - 1:self.size] == b"\n" else 1)
+
+    def _newline_pos(self, k: int) -> int:
+        """Position of the k-th (0-based) newline, -1 if not found/indexed"""
+        from bisect import bisect_right
+        _nblocks = len(self._blocks) if self.complete else len(self._blocks) - 1
+        j = bisect_right(self._blocks, k, 0, max(_nblocks, 0)) - 1
+        if j < 0 or (not self.complete and j >= _nblocks - 1 and k >= self._newlines):
+            return -1
+        pos = j * self.blocksize
+        for _ in range(k - self._blocks[j] + 1):
+            pos = self._mm.find(b"\n", pos)
+            if pos < 0:
+                return -1
+            pos += 1
+        return pos - 1
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        if i < 0 or self._mm is None:
+            raise IndexError(i)
+        if i == 0:
+            start = 0
+        else:
+            start = self._newline_pos(i - 1)
+            if start < 0 or start + 1 >= self.size:
+                raise IndexError(i)
+            start += 1
+        end = self._mm.find(b"\n", start)
+        end = self.size if end < 0 else end + 1
+        return self._decode(self._mm[start:end])
+
+    def __iter__(self) -> Iterator[str]:
+        pos = 0
+        while self._mm is not None and pos < self.size:
+            end = self._mm.find(b"\n", pos)
+            end = self.size if end < 0 else end + 1
+            yield self._decode(self._mm[pos:end])
+            pos = end
+
+    def close(self) -> None:
+        self._stop = True
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                # still used by the indexing thread
+                pass
+        self._file.close()
         return None
 
+    def __enter__(self) -> "MappedLines":
+        return self
+
+    def __exit__(self, *args) -> None:
+        return self.close()
+
 
 class dialog(object):
+    # default of askopenpath(recent=...)
+    recent: Optional[RecentPaths] = None
+
     @staticmethod
     def askopenpath(
-        initialpath: Union[str, Path],
+        initialpath: Union[str, Path, None],
         mode: str = "f",
         returntype: str = "str",
+        recent: Optional["RecentPaths"] = None,
+        timeout: float = PROBE_TIMEOUT,
     ) -> Union[str, Path, None]:
         """tkinter.filedialog.askopenfilename() / askdirectory()
 
+        `initialpath` is probed in a worker thread (results are cached for PROBE_TTL sec).
+        If it is None, not found or the probe times out, the most recent directory is used.
+
         Args:
             mode: 'f'=file, 'd'=dir
             returntype: 'str', 'Path'
+            recent: Recently used directories (default: `dialog.recent`)
+            timeout: Max seconds to wait for the probe
         """
-        initialpath = Path(initialpath).resolve()
-        if initialpath.is_dir():
-            dirpath = str(initialpath)
-            filename = None
-        elif initialpath.parent.is_dir():
-            dirpath = str(initialpath.parent)
-            filename = str(initialpath.name)
+        from tkinter import filedialog
+        if recent is None:
+            recent = dialog.recent
+        if initialpath is None:
+            dirpath, filename = None, None
         else:
-            dirpath = None
-            filename = None
+            dirpath, filename = _probe_path(initialpath, timeout=timeout)
+        if dirpath is None and recent is not None and len(recent) > 0:
+            dirpath = recent[0]
 
         mode = mode.lower()
         if mode in {"f", "file"}:
@@ -592,6 +3886,8 @@ class dialog(object):
         else:
             raise ValueError(f"Invalid mode: '{mode}'")
         if len(selectedpath) > 0:
+            if recent is not None:
+                recent.add(selectedpath if mode[0] == "d" else str(Path(selectedpath).parent))
             if returntype == "str":
                 return selectedpath
             elif returntype == "Path":
@@ -603,24 +3899,39 @@ class dialog(object):
 
     @staticmethod
     def asksave(
-        data: Union[str, bytes],
+        data: Union[str, bytes, Iterable[Union[str, bytes]], IO],
         title: str = "Save file",
         mode: str = "t",
         filetypes: Optional[List[Tuple[str]]] = None,
         initialdir: Union[Path, str, None] = None,
         initialfile: Union[Path, str, None] = None,
+        background: Optional[bool] = None,
+        progress: Optional[Callable[[int, Optional[int]], None]] = None,
+        on_done: Optional[Callable[[bool, Optional[Path]], None]] = None,
+        master: Optional[Misc] = None,
+        chunksize: int = SAVE_CHUNKSIZE,
         **kwargs,
     ) -> bool:
         """tkinter.filedialog.asksaveasfilename()
 
+        Data is written in chunks to a temporary file, which is renamed to the
+        selected path when complete (the original file is kept on error).
+
         Args:
+            data: str/bytes, iterable of str/bytes (e.g. generator), or file-like object (read)
             mode: 't'=text, 'b'=binary
             filetypes: example=[('CSV file', '.csv')]
+            background: If True, write in a worker thread and return at once
+                (None: True unless data is str/bytes)
+            progress: progress(written, total) on the Tk thread (total is None if unknown)
+            on_done: on_done(saved, path) on the Tk thread
+            master: Tk widget used for polling (default root if None)
             **kwargs: filedialog.asksaveasfilename(**kwargs)
 
         Retruns:
-            bool: True=saved
+            bool: True=saved (background: True=started)
         """
+        from tkinter import filedialog, messagebox
         _filepath = filedialog.asksaveasfilename(
             title=title,
             filetypes=filetypes,
@@ -630,13 +3941,131 @@ class dialog(object):
         )
         if len(_filepath) == 0:
             # cancel
+            if on_done is not None:
+                on_done(False, None)
             return False
-        try:
-            mode = "w" + mode
-            with Path(_filepath).open(mode=mode) as f:
-                f.write(data)
-        except Exception as e:
-            messagebox.showerror("File save error", str(e))
-            return False
-        messagebox.showinfo("File save", "Successfully saved.")
+        _filepath = Path(_filepath)
+        if background is None:
+            background = not isinstance(data, (str, bytes))
+        _total = len(data) if isinstance(data, (str, bytes)) else None
+
+        def _done(error: Optional[Exception]) -> bool:
+            if error is None:
+                messagebox.showinfo("File save", "Successfully saved.")
+            else:
+                messagebox.showerror("File save error", str(error))
+            if on_done is not None:
+                on_done(error is None, _filepath)
+            return error is None
+
+        if not background:
+            _written = [0]
+            try:
+                _write_atomic(_filepath, data, mode, chunksize, progress=_written.append)
+            except Exception as e:
+                return _done(e)
+            if progress is not None:
+                progress(_written[-1], _total)
+            return _done(None)
+
+        from threading import Thread
+        if master is None:
+            import tkinter
+            master = tkinter._default_root
+        _state: Dict[str, Any] = dict(written=0, reported=-1, done=False, error=None)
+
+        def _work() -> None:
+            def _progress(written: int) -> None:
+                _state["written"] = written
+                return None
+            try:
+                _write_atomic(_filepath, data, mode, chunksize, progress=_progress)
+            except Exception as e:
+                _state["error"] = e
+            _state["done"] = True
+            return None
+
+        def _poll() -> None:
+            if progress is not None and _state["written"] != _state["reported"]:
+                _state["reported"] = _state["written"]
+                progress(_state["written"], _total)
+            if _state["done"]:
+                _done(_state["error"])
+            else:
+                master.after(CONSOLE_INTERVAL, _poll)
+            return None
+
+        Thread(target=_work, daemon=True).start()
+        master.after(CONSOLE_INTERVAL, _poll)
         return True
+
+    @staticmethod
+    def askopen_preview(
+        initialpath: Union[str, Path, None],
+        nlines: int = 20,
+        title: str = "Preview",
+        encoding: str = "utf-8",
+        window: bool = True,
+        **kwargs,
+    ) -> Optional[MappedLines]:
+        """askopenpath() and memory-map the selected file
+
+        The head preview and the line index are computed in a worker thread
+        and shown in a SubWindow (if `window` is True).
+
+        Args:
+            nlines: Number of lines of the preview
+            **kwargs: askopenpath(**kwargs)
+
+        Returns:
+            MappedLines (None if canceled). Close it when no longer used.
+        """
+        _path = dialog.askopenpath(initialpath, mode="f", returntype="Path", **kwargs)
+        if _path is None:
+            return None
+        lines = MappedLines(_path, encoding=encoding)
+        if not window:
+            lines.start_indexing()
+            return lines
+
+        from threading import Thread
+        w = SubWindow(title=title, maxcolumn=1)
+        w.labels.add(str(_path), fullspan=True)
+        w.stringvars.add("lines", defaultvalue=f"Size: {lines.size:,} bytes / Lines: counting...")
+        w.labels.add(w.stringvars["lines"], fullspan=True)
+        w.consoles.add(name="preview", height=nlines, maxlines=nlines, wrap="none")
+        w.buttons.add("Close[ESC]", w.close, fullspan=True)
+        w.bind("<Escape>", w.close)
+        _preview: Console = w.consoles["preview"]
+
+        def _work() -> None:
+            _preview.write("\n".join(lines.head(nlines)))
+            lines.build_index()
+            return None
+
+        def _ondestroy(event) -> None:
+            if event.widget is w:
+                # stop counting lines (the file stays open for the caller)
+                lines._stop = True
+            return None
+
+        def _poll() -> None:
+            try:
+                if "lines" not in w.stringvars or not w.winfo_exists():
+                    # closed (see _cleanup_window)
+                    return None
+                if lines.complete:
+                    w.stringvars.set("lines", f"Size: {lines.size:,} bytes / Lines: {len(lines):,}")
+                    return None
+                _ratio = lines.indexed / lines.size
+                w.stringvars.set("lines", f"Size: {lines.size:,} bytes / Lines: counting... ({_ratio:.0%})")
+                w.after(CONSOLE_INTERVAL * 4, _poll)
+            except TclError:
+                # closed
+                pass
+            return None
+
+        w.bind("<Destroy>", _ondestroy, add="+")
+        Thread(target=_work, daemon=True).start()
+        _poll()
+        return lines